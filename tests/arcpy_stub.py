@@ -0,0 +1,49 @@
+""" Minimal stand in for arcpy so the model layer can be imported and tested outside ArcGIS Pro
+
+Any attribute of a stub module is a new empty class, which is enough for the annotations, 
+isinstance checks and module level imports of the repo. Tests replace the parts they use
+(e.g. cursors) with fakes through monkeypatch.
+"""
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1].absolute()
+STUB_MODULES = \
+    (
+        "arcpy",
+        "arcpy.da",
+        "arcpy.mp",
+        "arcpy.management",
+        "arcpy.conversion",
+        "arcpy.typing",
+        "arcpy.typing.describe",
+    )
+
+class StubModule(types.ModuleType):
+    def __getattr__(self, name: str) -> type:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = type(name, (), {"__init__": lambda self, *args, **kwargs: None, "__module__": self.__name__})
+        setattr(self, name, value)
+        return value
+
+def install() -> bool:
+    """ Add the repo module roots to sys.path and install the stub if arcpy is not importable 
+    return: True if the stub is used
+    """
+    for path in (ROOT, ROOT / "utils", ROOT / "tools"):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+    try:
+        import arcpy
+        return False
+    except ImportError:
+        pass
+    for name in STUB_MODULES:
+        sys.modules[name] = StubModule(name)
+    for name in STUB_MODULES:
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(sys.modules[parent], child, sys.modules[name])
+    return True
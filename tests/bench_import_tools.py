@@ -0,0 +1,90 @@
+""" Toolbox load time of eager against lazy import_tools
+
+Generates a package of synthetic tools in a temporary directory. Importing each tool module
+sleeps for the given time, as a stand in for arcpy and dependency imports inside Pro. Every
+scenario starts with the tool modules unloaded, like a toolbox refresh in a new session.
+
+usage:
+    python -m tests.bench_import_tools [tools] [import seconds]
+"""
+import importlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .benchmark import report
+
+from utils.reloader import import_tools
+
+PACKAGE = "bench_tools"
+
+TOOL_SOURCE = \
+'''import time
+from tool import Tool
+
+# Stands in for the arcpy and dependency imports of a real tool module
+time.sleep({import_seconds})
+
+class {name}(Tool):
+    lazy_load = {lazy_load}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.label = "{name}"
+        self.description = "Synthetic tool"
+        self.category = "Benchmark"
+        return
+'''
+
+def write_tools(root: os.PathLike, count: int, import_seconds: float = 0.0, eager: tuple[str, ...] = ()) -> dict[str, list[str]]:
+    """ Write count tool modules to root/bench_tools/tools and return the tool dict for import_tools
+    Tools named in eager set lazy_load = False
+    """
+    package = Path(root, PACKAGE, "tools")
+    package.mkdir(parents=True, exist_ok=True)
+    Path(root, PACKAGE, "__init__.py").touch()
+    Path(package, "__init__.py").touch()
+    names = [f"Tool{idx}" for idx in range(1, count + 1)]
+    for name in names:
+        source = TOOL_SOURCE.format(name=name, import_seconds=import_seconds, lazy_load=name not in eager)
+        Path(package, f"{name}.py").write_text(source)
+    importlib.invalidate_caches()
+    return {"tools": names}
+
+def unload_tools() -> None:
+    """ Remove the synthetic tool modules so the next import_tools starts cold """
+    for name in [name for name in sys.modules if name == PACKAGE or name.startswith(f"{PACKAGE}.")]:
+        del sys.modules[name]
+    return
+
+def loaded_tools() -> int:
+    return sum(1 for name in sys.modules if name.startswith(f"{PACKAGE}.tools."))
+
+def main(count: int = 20, import_seconds: float = 0.05) -> None:
+    with tempfile.TemporaryDirectory() as root:
+        sys.path.insert(0, root)
+        tool_dict = write_tools(root, count, import_seconds)
+        manifest = Path(root, "tool_manifest.json")
+        scenarios = \
+            {
+                "eager": lambda: import_tools(tool_dict, PACKAGE),
+                "lazy, no manifest": lambda: import_tools(tool_dict, PACKAGE, lazy=True, manifest=manifest),
+                "lazy, manifest": lambda: import_tools(tool_dict, PACKAGE, lazy=True, manifest=manifest),
+                "lazy, open one tool": lambda: import_tools(tool_dict, PACKAGE, lazy=True, manifest=manifest)[0]().getParameterInfo(),
+            }
+        results = []
+        for name, scenario in scenarios.items():
+            unload_tools()
+            start = time.perf_counter()
+            scenario()
+            seconds = time.perf_counter() - start
+            results.append({"load": name, "seconds": seconds, "modules imported": loaded_tools()})
+        sys.path.remove(root)
+        unload_tools()
+    report(f"import_tools ({count} tools, {import_seconds} s per module import)", results)
+    return
+
+if __name__ == "__main__":
+    main(*(int(arg) if idx == 0 else float(arg) for idx, arg in enumerate(sys.argv[1:])))
@@ -0,0 +1,55 @@
+""" Memory and lookup speed of OIDIndex against a set of OIDs
+
+Table.__getitem__, __setitem__ and __delitem__ validate OIDs against the index of the current
+query (Table._oid_set). This builds that index from a synthetic cursor for dense and sparse
+OIDs and compares the memory it keeps alive and the time of membership checks with set[int].
+
+usage:
+    python -m tests.bench_oid_index [rows]
+"""
+import random
+import sys
+
+from .benchmark import mib, report, timed, traced
+
+from utils.models import OIDIndex
+
+PROBES = 100_000
+
+def oid_cursor(oids: list[int]):
+    """ Rows of a search cursor on ["OID@"] (cursors return OIDs in ascending order) """
+    return ((oid,) for oid in oids)
+
+def main(rows: int = 1_000_000) -> None:
+    rng = random.Random(0)
+    layouts = \
+        {
+            # Freshly loaded featureclass
+            "dense": list(range(1, rows + 1)),
+            # Every 10th feature deleted
+            "dense with gaps": [oid for oid in range(1, int(rows * 1.1) + 1) if oid % 10],
+            # Query result that matches 1 in 10 features
+            "sparse": sorted(rng.sample(range(1, rows * 10 + 1), rows)),
+        }
+    results = []
+    for layout, oids in layouts.items():
+        probes = [rng.randrange(1, oids[-1] + 1) for _ in range(PROBES)]
+        for name, build in (("set", set), ("OIDIndex", OIDIndex)):
+            index, retained, peak = traced(lambda: build(oid for oid, in oid_cursor(oids)))
+            results.append(
+                {
+                    "layout": layout,
+                    "index": name,
+                    "OIDs": len(index),
+                    "retained MiB": mib(retained),
+                    "peak MiB": mib(peak),
+                    "build s": timed(lambda: build(oid for oid, in oid_cursor(oids)), repeat=3),
+                    "lookups/s": PROBES / timed(lambda: [probe in index for probe in probes]),
+                }
+            )
+            del index
+    report(f"OIDIndex against set[int] ({rows:,} OIDs)", results)
+    return
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
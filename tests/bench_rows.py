@@ -0,0 +1,48 @@
+""" Rows per second and allocations of as_rows against as_dict
+
+Both row factories read the same FakeSearchCursor. Streaming reads one field of every row
+and keeps nothing, materialized keeps every row in a list (e.g. list(table) or caching).
+
+usage:
+    python -m tests.bench_rows [rows] [fields]
+"""
+import sys
+
+from .benchmark import mib, report, timed, traced
+from .fakes import FakeBackend, FakeCursor, FakeSearchCursor
+
+from utils.models import as_dict, as_rows
+
+def main(rows: int = 200_000, fields: int = 10) -> None:
+    backend = FakeBackend()
+    FakeCursor.backend = backend
+    backend.oid_fields["bench"] = "OBJECTID"
+    names = ["OBJECTID", *(f"FIELD_{idx}" for idx in range(1, fields))]
+    backend.tables["bench"] = [{name: oid * idx for idx, name in enumerate(names, start=1)} for oid in range(rows)]
+
+    def cursor() -> FakeSearchCursor:
+        return FakeSearchCursor("bench", names)
+
+    # Cursor reads without a row factory, subtracted from the streaming time
+    baseline = timed(lambda: sum(1 for _ in cursor()), repeat=3)
+    results = []
+    for name, factory in (("as_dict", as_dict), ("as_rows", as_rows)):
+        streamed = timed(lambda: sum(row["FIELD_1"] for row in factory(cursor())), repeat=3)
+        _, _, stream_peak = traced(lambda: sum(row["FIELD_1"] for row in factory(cursor())))
+        materialized, retained, _ = traced(lambda: list(factory(cursor())))
+        del materialized
+        results.append(
+            {
+                "factory": name,
+                "rows/s": rows / streamed,
+                "factory s": max(streamed - baseline, 0.0),
+                "stream peak MiB": mib(stream_peak),
+                "list MiB": mib(retained),
+                "bytes/row": retained / rows,
+            }
+        )
+    report(f"Row factories ({rows:,} rows x {fields} fields, cursor read {baseline:.3f} s)", results)
+    return
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,113 @@
+""" Output size and pipeline time of raw against dissolved vertex buffers
+
+Runs the vectorized VertexBuffer pipeline (wkb_circles -> dissolve_rows) over synthetic
+polylines without arcpy. Geometries are StubPolygons whose union is the convex hull of both
+inputs, a stand in for Geometry.union that keeps the vertex count (and so the output size)
+of a dissolved feature in the right range. Real unions keep concave bends, so the dissolved
+sizes here are a lower bound. The dissolved time is mostly the pure python hull, it shows the 
+overhead of grouping and WKB conversion, not the cost of Geometry.union.
+
+usage:
+    python -m tests.bench_vertex_buffer [features] [vertices per feature]
+"""
+import struct
+import sys
+from itertools import islice
+
+import numpy as np
+
+from .benchmark import mib, report, timed
+
+from tools.production import VertexBuffer
+from tools.production.VertexBuffer import BATCH_SIZE, circle_ring, dissolve_rows, vertex_indexes, wkb_circles
+
+RADIUS = 10.0
+SPACING = 8.0
+
+class StubPolygon:
+    """ Single ring polygon with the parts of the arcpy.Geometry interface used by dissolve_rows """
+    def __init__(self, points: np.ndarray) -> None:
+        self.points = points
+        return
+
+    @classmethod
+    def from_wkb(cls, wkb: bytes, spatial_reference=None) -> "StubPolygon":
+        # Single ring polygon as written by wkb_circles (13 byte header)
+        count, = struct.unpack_from("<I", wkb, 9)
+        return cls(np.frombuffer(wkb, dtype="<f8", count=count*2, offset=13).reshape(count, 2))
+
+    def union(self, other: "StubPolygon") -> "StubPolygon":
+        return StubPolygon(convex_hull(np.concatenate((self.points, other.points))))
+
+    @property
+    def WKB(self) -> bytes:
+        return struct.pack("<BIII", 1, 3, 1, len(self.points)) + self.points.astype("<f8").tobytes()
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    """ Closed clockwise hull ring of points (monotone chain) """
+    points = [tuple(point) for point in np.unique(points, axis=0).tolist()]
+    def chain(ordered: list[tuple[float, float]]) -> list[tuple[float, float]]:
+        hull: list[tuple[float, float]] = []
+        for x, y in ordered:
+            while len(hull) > 1:
+                (x1, y1), (x2, y2) = hull[-2], hull[-1]
+                if (x2 - x1)*(y - y1) - (y2 - y1)*(x - x1) < 0:
+                    break
+                hull.pop()
+            hull.append((x, y))
+        return hull
+    ring = chain(points)[:-1] + chain(points[::-1])[:-1]
+    return np.array([*ring, ring[0]])
+
+def vertices(features: int, per_feature: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """ XY and OID of the exploded vertices of random walk polylines (buffers of a feature overlap) """
+    rng = np.random.default_rng(seed)
+    angles = np.cumsum(rng.normal(0, 0.3, (features, per_feature)), axis=1)
+    steps = SPACING * np.stack((np.cos(angles), np.sin(angles)), axis=-1)
+    origins = rng.uniform(0, 1e6, (features, 1, 2))
+    xy = (origins + np.cumsum(steps, axis=1)).reshape(-1, 2)
+    return xy, np.repeat(np.arange(1, features + 1), per_feature)
+
+def buffer_rows(xy: np.ndarray, oids: np.ndarray):
+    """ Rows of vectorized_buffer_rows without the FeatureClassToNumPyArray read """
+    ring = circle_ring()
+    vertex_idx = vertex_indexes(oids)
+    for start in range(0, len(xy), BATCH_SIZE):
+        stop = start + BATCH_SIZE
+        yield from zip(wkb_circles(xy[start:stop], RADIUS, ring), oids[start:stop].tolist(), vertex_idx[start:stop].tolist())
+
+def write(rows) -> tuple[int, int]:
+    """ Consume rows in insert cursor batches, return (rows, output bytes) """
+    count = size = 0
+    while batch := list(islice(rows, BATCH_SIZE)):
+        count += len(batch)
+        size += sum(len(shape if isinstance(shape, (bytes, bytearray)) else shape.WKB) for shape, *_ in batch)
+    return count, size
+
+def main(features: int = 500, per_feature: int = 50) -> None:
+    VertexBuffer.arcpy.FromWKB = StubPolygon.from_wkb
+    xy, oids = vertices(features, per_feature)
+    pipelines = \
+        {
+            "raw": lambda: write(buffer_rows(xy, oids)),
+            "dissolved": lambda: write(dissolve_rows(buffer_rows(xy, oids), None)),
+        }
+    results = []
+    for name, pipeline in pipelines.items():
+        count, size = pipeline()
+        seconds = timed(pipeline, repeat=1)
+        results.append(
+            {
+                "output": name,
+                "rows": count,
+                "output MiB": mib(size),
+                "bytes/feature": size / features,
+                "seconds": seconds,
+                "vertices/s": len(xy) / seconds,
+            }
+        )
+    report(f"VertexBuffer output ({features:,} features x {per_feature} vertices, stub union)", results)
+    return
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
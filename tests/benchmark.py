@@ -0,0 +1,55 @@
+""" Timing and memory helpers for the benchmark scripts (bench_*.py)
+
+Benchmarks are not collected by pytest, run them as modules from the repo root:
+    python -m tests.bench_oid_index
+"""
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from .arcpy_stub import install
+
+# Benchmarks run against the stub when arcpy is not importable
+install()
+
+def timed(func: Callable[[], Any], repeat: int = 5) -> float:
+    """ Best wall time of repeat calls in seconds (memory tracing is off) """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def traced(factory: Callable[[], Any]) -> tuple[Any, int, int]:
+    """ Call factory with memory tracing on
+    return: (result, bytes still allocated while the result is alive, peak bytes)
+    """
+    tracemalloc.start()
+    try:
+        result = factory()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, retained, peak
+
+def report(title: str, rows: list[dict[str, Any]]) -> None:
+    """ Print rows of results as an aligned table """
+    columns = list(rows[0])
+    cells = [[format_cell(row[column]) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(row[idx]) for row in cells)) for idx, column in enumerate(columns)]
+    print(f"\n{title}")
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in cells:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+    return
+
+def format_cell(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:,.3f}" if value < 1000 else f"{value:,.0f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+def mib(size: int) -> float:
+    return size / 2**20
@@ -0,0 +1,3 @@
+from .arcpy_stub import install
+
+install()
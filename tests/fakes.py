@@ -0,0 +1,174 @@
+""" In memory cursor backend and table builders for testing the model layer without arcpy
+
+Tables are created with make_table, which sets the attributes that Table.__init__ reads from
+Describe and ListFields. Install the fake cursors with install_cursors(monkeypatch, backend).
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+import utils.models as models
+
+@dataclass
+class FakeField:
+    name: str
+    type: str
+    isNullable: bool = True
+    editable: bool = True
+    length: int = 0
+    aliasName: str = ""
+
+@dataclass
+class FakeSpatialReference:
+    factoryCode: int = 3857
+    name: str = "WGS_1984_Web_Mercator_Auxiliary_Sphere"
+
+    def exportToString(self) -> str:
+        return f'PROJCS["{self.name}"]'
+
+@dataclass
+class FakeBackend:
+    """ Rows of each table path as dictionaries, the geometry is stored as WKB under "SHAPE@WKB" """
+    tables: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    oid_fields: dict[str, str] = field(default_factory=dict)
+
+    def rows(self, path: str) -> list[dict[str, Any]]:
+        return self.tables.setdefault(path, [])
+
+class FakeEditSession:
+    def __init__(self) -> None:
+        self.depth = 0
+        self.operations = 0
+        return
+    def __enter__(self):
+        self.depth += 1
+        return self
+    def __exit__(self, *exc) -> None:
+        self.depth -= 1
+        return
+    def tick(self, operations: int = 1) -> None:
+        self.operations += operations
+        return
+    def commit(self) -> None:
+        return
+
+# BETWEEN, IN and comparison predicates joined by AND/OR, translated to a python expression
+PREDICATE = re.compile(
+    r"(\w+) BETWEEN (\S+) AND (\S+)"
+    r"|(\w+) IN \(([^)]*)\)"
+    r"|(\w+) (=|<>|>=|<=|>|<) "
+    r"|\b(AND|OR)\b"
+)
+OPERATORS = {"=": "==", "<>": "!="}
+
+def _translate(match: re.Match) -> str:
+    between_field, low, high, in_field, values, field, operator, junction = match.groups()
+    if between_field:
+        return f"({low} <= row[{between_field!r}] <= {high})"
+    if in_field:
+        return f"row[{in_field!r}] in ({values},)"
+    if field:
+        return f"row[{field!r}] {OPERATORS.get(operator, operator)} "
+    return junction.lower()
+
+def matches(row: dict[str, Any], where_clause: str | None) -> bool:
+    """ Evaluate the where clauses generated by the model layer and simple comparisons """
+    if not where_clause:
+        return True
+    return eval(PREDICATE.sub(_translate, where_clause), {}, {"row": row})
+
+class FakeCursor:
+    backend: FakeBackend = None
+
+    def __init__(self, path: str, fields: list[str], where_clause: str = None, **kwargs) -> None:
+        self.path = path
+        self.fields = tuple(fields)
+        self.where_clause = where_clause
+        self.kwargs = kwargs
+        return
+
+    def _key(self, name: str) -> str:
+        return self.backend.oid_fields[self.path] if name == "OID@" else name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return
+
+class FakeSearchCursor(FakeCursor):
+    """ Iterator over the matching rows (like arcpy cursors, iter() returns the cursor itself) """
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._rows = None
+        self._current: dict[str, Any] = None
+        return
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> tuple:
+        if self._rows is None:
+            self._rows = iter([row for row in self.backend.rows(self.path) if matches(row, self.where_clause)])
+        self._current = next(self._rows)
+        return tuple(self._current.get(self._key(name)) for name in self.fields)
+
+class FakeUpdateCursor(FakeSearchCursor):
+    def updateRow(self, values: tuple) -> None:
+        self._current.update({self._key(name): value for name, value in zip(self.fields, values)})
+        return
+
+    def deleteRow(self) -> None:
+        self.backend.rows(self.path).remove(self._current)
+        return
+
+class FakeInsertCursor(FakeCursor):
+    def insertRow(self, values: tuple) -> int:
+        rows = self.backend.rows(self.path)
+        oid_field = self.backend.oid_fields[self.path]
+        oid = max((row[oid_field] for row in rows), default=0) + 1
+        row = {self._key(name): value for name, value in zip(self.fields, values)}
+        row[oid_field] = oid
+        rows.append(row)
+        return oid
+
+def install_cursors(monkeypatch, backend: FakeBackend) -> None:
+    """ Replace the arcpy.da cursors used by utils.models with cursors over backend """
+    monkeypatch.setattr(FakeCursor, "backend", backend)
+    monkeypatch.setattr(models, "SearchCursor", FakeSearchCursor)
+    monkeypatch.setattr(models, "UpdateCursor", FakeUpdateCursor)
+    monkeypatch.setattr(models, "InsertCursor", FakeInsertCursor)
+    return
+
+def make_table(backend: FakeBackend, path: str, fields: list[FakeField], *,
+               shape_type: str = None,
+               spatial_reference: FakeSpatialReference = None) -> models.Table:
+    """ Build a Table (or FeatureClass if shape_type is set) over backend without Describe """
+    cls = models.FeatureClass if shape_type else models.Table
+    table = cls.__new__(cls)
+    table.path = path
+    table.workspace = os.path.dirname(path)
+    table.name = table.basename = os.path.basename(path)
+    table._query = None
+    table._spatial_filter = None
+    table._oid_filter = None
+    table._current_query = None
+    table.queries = models.QueryManager(table)
+    table.lazy = True
+    table.OIDField = next(field.name for field in fields if field.type == "OID")
+    table.cursor_tokens = ["CREATED@", "CREATOR@", "EDITED@", "EDITOR@", "GLOBALID@", "OID@", "SUBTYPE@", "*"]
+    table._updated = False
+    table._iter = None
+    table.row_factory = models.as_dict
+    table._row_cache = models.RowCache(0)
+    table.__dict__["fields"] = {field.name: field for field in fields}
+    table.__dict__["editor"] = FakeEditSession()
+    if shape_type:
+        table.shapeType = shape_type
+        table.shapeFieldName = next(field.name for field in fields if field.type == "Geometry")
+        table.spatialReference = spatial_reference or FakeSpatialReference()
+        table.cursor_tokens.extend(["SHAPE@", "SHAPE@XY", "SHAPE@JSON", "SHAPE@WKB", "SHAPE@WKT"])
+    backend.oid_fields[path] = table.OIDField
+    backend.rows(path)
+    return table
@@ -0,0 +1,103 @@
+import json
+import struct
+from datetime import datetime
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from .fakes import FakeBackend, FakeField, FakeSpatialReference, install_cursors, make_table
+
+FIELDS = \
+    [
+        FakeField("OBJECTID", "OID", isNullable=False, editable=False),
+        FakeField("NAME", "String", length=50),
+        FakeField("COUNT", "Integer"),
+        FakeField("VALUE", "Double"),
+        FakeField("CREATED", "Date"),
+        FakeField("Shape", "Geometry"),
+        FakeField("Shape_Length", "Double", editable=False),
+    ]
+
+def point_wkb(x: float, y: float) -> bytearray:
+    # SHAPE@WKB returns a bytearray
+    return bytearray(struct.pack("<BIdd", 1, 1, x, y))
+
+ROWS = \
+    [
+        {"OBJECTID": 1, "NAME": "a", "COUNT": 1, "VALUE": 1.5, "CREATED": datetime(2024, 1, 2, 3, 4, 5), "SHAPE@WKB": point_wkb(1, 2), "Shape_Length": 0.0},
+        {"OBJECTID": 2, "NAME": None, "COUNT": None, "VALUE": None, "CREATED": None, "SHAPE@WKB": None, "Shape_Length": 0.0},
+        {"OBJECTID": 5, "NAME": "c", "COUNT": -7, "VALUE": -0.25, "CREATED": datetime(1999, 12, 31), "SHAPE@WKB": point_wkb(-3.5, 4.25), "Shape_Length": 0.0},
+    ]
+
+@pytest.fixture
+def backend(monkeypatch) -> FakeBackend:
+    backend = FakeBackend()
+    install_cursors(monkeypatch, backend)
+    return backend
+
+def make_points(backend: FakeBackend, path: str, spatial_reference: FakeSpatialReference = None):
+    return make_table(backend, path, FIELDS, shape_type="Point", spatial_reference=spatial_reference)
+
+def test_parquet_round_trip(backend, tmp_path):
+    source = make_points(backend, "/gdb/source")
+    backend.rows("/gdb/source").extend(dict(row) for row in ROWS)
+    target = make_points(backend, "/gdb/target")
+    parquet = tmp_path / "points.parquet"
+    
+    assert source.to_parquet(parquet, batch_size=2) == len(ROWS)
+    assert target.load_parquet(parquet, batch_size=2) == len(ROWS)
+    
+    loaded = backend.rows("/gdb/target")
+    for original, row in zip(ROWS, loaded):
+        for name in ("NAME", "COUNT", "VALUE", "CREATED"):
+            assert row[name] == original[name]
+        expected = bytes(original["SHAPE@WKB"]) if original["SHAPE@WKB"] is not None else None
+        assert row["SHAPE@WKB"] == expected
+        # Read only fields are not inserted
+        assert "Shape_Length" not in row
+    # New OIDs are assigned by the target
+    assert [row["OBJECTID"] for row in loaded] == [1, 2, 3]
+
+def test_arrow_types_and_nulls(backend):
+    source = make_points(backend, "/gdb/source")
+    backend.rows("/gdb/source").extend(dict(row) for row in ROWS)
+    table = source.to_arrow(batch_size=2)
+    
+    assert table.schema.field("OBJECTID").type == pa.int64()
+    assert table.schema.field("NAME").type == pa.string()
+    assert table.schema.field("COUNT").type == pa.int32()
+    assert table.schema.field("VALUE").type == pa.float64()
+    assert table.schema.field("CREATED").type == pa.timestamp("us")
+    assert table.schema.field("Shape").type == pa.binary()
+    assert table.num_rows == len(ROWS)
+    assert table.column("COUNT").null_count == 1
+    assert table.column("Shape").null_count == 1
+    assert table.column("Shape")[0].as_py() == bytes(ROWS[0]["SHAPE@WKB"])
+
+def test_empty_table(backend, tmp_path):
+    source = make_points(backend, "/gdb/source")
+    parquet = tmp_path / "empty.parquet"
+    assert source.to_parquet(parquet) == 0
+    assert pq.read_table(parquet).num_rows == 0
+
+def test_geoparquet_metadata(backend):
+    projected = make_points(backend, "/gdb/projected").arrow_schema()
+    geo = json.loads(projected.metadata[b"geo"])
+    assert geo["primary_column"] == "Shape"
+    assert geo["columns"]["Shape"]["encoding"] == "WKB"
+    # Esri WKT is not valid GeoParquet crs, so the crs is unknown
+    assert geo["columns"]["Shape"]["crs"] is None
+    assert projected.metadata[b"esri:spatial_reference"].startswith(b"PROJCS")
+    
+    wgs84 = make_points(backend, "/gdb/wgs84", FakeSpatialReference(4326, "GCS_WGS_1984")).arrow_schema()
+    assert "crs" not in json.loads(wgs84.metadata[b"geo"])["columns"]["Shape"]
+
+def test_table_without_geometry(backend, tmp_path):
+    fields = [field for field in FIELDS if field.type != "Geometry"]
+    source = make_table(backend, "/gdb/table", fields)
+    backend.rows("/gdb/table").extend({k: v for k, v in row.items() if k != "SHAPE@WKB"} for row in ROWS)
+    schema = source.arrow_schema()
+    assert b"geo" not in (schema.metadata or {})
+    assert source.to_arrow().num_rows == len(ROWS)
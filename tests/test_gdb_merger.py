@@ -0,0 +1,144 @@
+import os
+import time
+
+import pytest
+
+from .arcpy_stub import install
+
+# Spawned workers import this module without the conftest
+install()
+
+import utils.models as models
+from tools.production import GDBMerger
+from tools.production.GDBMerger import StagedTable, merge_parallel, read_staged, stage_gdb
+
+from .fakes import FakeBackend, FakeCursor, FakeField, FakeSearchCursor, make_table
+
+PARCEL_FIELDS = \
+    [
+        FakeField("OBJECTID", "OID", isNullable=False, editable=False),
+        FakeField("OWNER", "String", length=50),
+        FakeField("AREA", "Double"),
+    ]
+
+ROAD_FIELDS = \
+    [
+        FakeField("OBJECTID", "OID", isNullable=False, editable=False),
+        FakeField("NAME", "String", length=50),
+    ]
+
+# Input geodatabases by path: {table: (fields, rows)}
+CATALOG = \
+    {
+        "/data/target.gdb": {
+            "Parcels": (PARCEL_FIELDS, []),
+            "Roads": (ROAD_FIELDS, []),
+        },
+        # Same schema as the target listed in another order, both tables are appended directly
+        "/data/a.gdb": {
+            "Roads": (ROAD_FIELDS, [{"OBJECTID": 1, "NAME": "Main"}]),
+            "Parcels": (PARCEL_FIELDS, [{"OBJECTID": 1, "OWNER": "a", "AREA": 1.0}]),
+        },
+        # Roads has an additional field, so the matching fields are staged
+        "/data/b.gdb": {
+            "Parcels": (PARCEL_FIELDS, [{"OBJECTID": 1, "OWNER": "b", "AREA": 2.0}]),
+            "Roads": (
+                [*ROAD_FIELDS, FakeField("LANES", "Integer")],
+                [{"OBJECTID": 1, "NAME": "Oak", "LANES": 2}, {"OBJECTID": 2, "NAME": "Elm", "LANES": 4}],
+            ),
+        },
+        # Missing Roads
+        "/data/c.gdb": {
+            "Parcels": (PARCEL_FIELDS, [{"OBJECTID": 1, "OWNER": "c", "AREA": 3.0}]),
+        },
+    }
+
+# Rows of all fake tables (one backend per process)
+BACKEND = FakeBackend()
+
+# Seconds a worker waits before staging each input, so later inputs finish first
+STAGING_DELAY = {"/data/a.gdb": 1.0, "/data/b.gdb": 0.5}
+
+class FakeWorkspace:
+    """ Workspace over CATALOG with the children as fake tables """
+    def __init__(self, path: str, **filters) -> None:
+        self.path = path
+        self.name = os.path.basename(path)
+        self.children = {}
+        for name, (fields, rows) in CATALOG[path].items():
+            table_path = f"{path}/{name}"
+            table = make_table(BACKEND, table_path, fields)
+            table.__dict__["record_count"] = len(rows)
+            BACKEND.tables[table_path] = [dict(row) for row in rows]
+            self.children[name] = table
+        self.featureclasses = {}
+        self.tables = {name: table.path for name, table in self.children.items()}
+        return
+
+    def __getitem__(self, name: str) -> models.Table:
+        return self.children[name]
+
+def stage_fake_gdb(gdb_path: str, *args, **kwargs) -> GDBMerger.StagedGDB:
+    """ stage_gdb with fake workspaces (runs in the spawned worker) """
+    time.sleep(STAGING_DELAY.get(gdb_path, 0))
+    GDBMerger.Workspace = FakeWorkspace
+    FakeCursor.backend = BACKEND
+    models.SearchCursor = FakeSearchCursor
+    return stage_gdb(gdb_path, *args, **kwargs)
+
+def target_schema(target: FakeWorkspace) -> dict[str, tuple[list[str], str]]:
+    return {name: (table.fieldnames, table.fingerprint) for name, table in target.children.items()}
+
+@pytest.fixture
+def commits(monkeypatch) -> list[tuple[str, str, list[tuple]]]:
+    """ Record the staged tables committed by merge_parallel as (gdb, table, rows) """
+    commits = []
+    def commit_staged(staged: StagedTable, target, **kwargs) -> None:
+        if staged.append_from:
+            commits.append((os.path.dirname(staged.append_from), staged.name, None))
+        else:
+            rows = [row for chunk in read_staged(staged) for row in chunk]
+            commits.append((None, staged.name, rows))
+        return
+    monkeypatch.setattr(GDBMerger, "stage_gdb", stage_fake_gdb)
+    monkeypatch.setattr(GDBMerger, "commit_staged", commit_staged)
+    return commits
+
+def test_parallel_commits_in_input_order(commits):
+    target = FakeWorkspace("/data/target.gdb")
+    merge_parallel(["/data/a.gdb", "/data/b.gdb", "/data/c.gdb"], target, False, workers=3)
+    assert commits == \
+        [
+            ("/data/a.gdb", "Parcels", None),
+            ("/data/a.gdb", "Roads", None),
+            ("/data/b.gdb", "Parcels", None),
+            (None, "Roads", [(1, "Oak"), (2, "Elm")]),
+            ("/data/c.gdb", "Parcels", None),
+        ]
+
+def test_parallel_strict_merge_rejects_mismatched_inputs(commits):
+    target = FakeWorkspace("/data/target.gdb")
+    merge_parallel(["/data/c.gdb", "/data/b.gdb"], target, True, workers=2)
+    # c.gdb is missing Roads and the Roads table of b.gdb has an additional field
+    assert commits == [("/data/b.gdb", "Parcels", None)]
+
+@pytest.fixture
+def fake_workspaces(monkeypatch) -> None:
+    monkeypatch.setattr(GDBMerger, "Workspace", FakeWorkspace)
+    monkeypatch.setattr(FakeCursor, "backend", BACKEND)
+    monkeypatch.setattr(models, "SearchCursor", FakeSearchCursor)
+    return
+
+def test_strict_merge_rejects_missing_children(fake_workspaces, tmp_path):
+    schema = target_schema(FakeWorkspace("/data/target.gdb"))
+    staged = stage_gdb("/data/c.gdb", schema, True, str(tmp_path))
+    assert staged.rejected
+    assert staged.tables == []
+    assert ("\t\t\tMissing from c.gdb:\n['Roads']", "WARNING") in staged.messages
+
+def test_strict_merge_skips_mismatched_tables(fake_workspaces, tmp_path):
+    schema = target_schema(FakeWorkspace("/data/target.gdb"))
+    staged = stage_gdb("/data/b.gdb", schema, True, str(tmp_path))
+    assert not staged.rejected
+    assert [table.name for table in staged.tables] == ["Parcels"]
+    assert ("\t\t\tAdditional in Roads:\n['LANES']", "WARNING") in staged.messages
@@ -0,0 +1,58 @@
+import json
+import multiprocessing
+
+from .arcpy_stub import install
+
+# Spawned workers import this module without the conftest
+install()
+
+from utils.models import JSONCache
+
+WORKERS = 4
+ENTRIES = 50
+
+def fill_cache(cache_file: str, worker: int) -> None:
+    cache = JSONCache(cache_file)
+    for entry in range(ENTRIES):
+        cache.set(f"/workspace/{worker}/{entry}", 1.0, entry)
+    return
+
+def test_set_and_get(tmp_path):
+    cache = JSONCache(tmp_path / "cache.json")
+    cache.set("/workspace/a", 1.0, {"tables": ["A"]})
+    assert cache.get("/workspace/a", 1.0) == {"tables": ["A"]}
+    assert cache.get("/workspace/a", 2.0) is None
+    assert JSONCache(tmp_path / "cache.json").get("/workspace/a", 1.0) == {"tables": ["A"]}
+
+def test_none_stamp_is_not_cached(tmp_path):
+    cache = JSONCache(tmp_path / "cache.json")
+    cache.set("/workspace/a", None, 1)
+    assert cache.get("/workspace/a", None) is None
+    assert not (tmp_path / "cache.json").exists()
+
+def test_instances_merge_on_save(tmp_path):
+    first = JSONCache(tmp_path / "cache.json")
+    second = JSONCache(tmp_path / "cache.json")
+    first.set("/workspace/a", 1.0, "a")
+    second.set("/workspace/b", 1.0, "b")
+    entries = json.loads((tmp_path / "cache.json").read_text())
+    assert len(entries) == 2
+
+def test_failed_write_is_not_fatal(tmp_path):
+    # The cache file path is a directory, so the write fails
+    (tmp_path / "cache.json").mkdir()
+    cache = JSONCache(tmp_path / "cache.json")
+    cache.set("/workspace/a", 1.0, "a")
+    assert cache.get("/workspace/a", 1.0) == "a"
+
+def test_concurrent_processes(tmp_path):
+    cache_file = str(tmp_path / "cache.json")
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=fill_cache, args=(cache_file, worker)) for worker in range(WORKERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0] * WORKERS
+    assert len(json.loads((tmp_path / "cache.json").read_text())) == WORKERS * ENTRIES
+    assert [path.name for path in tmp_path.iterdir()] == ["cache.json"]
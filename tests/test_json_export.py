@@ -0,0 +1,52 @@
+import io
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+from .fakes import FakeBackend, FakeField, install_cursors, make_table
+
+FIELDS = \
+    [
+        FakeField("OBJECTID", "OID", isNullable=False, editable=False),
+        FakeField("NAME", "String", length=50),
+        FakeField("CREATED", "Date"),
+    ]
+
+@pytest.fixture
+def table(monkeypatch):
+    backend = FakeBackend()
+    install_cursors(monkeypatch, backend)
+    table = make_table(backend, "/data/test.gdb/Events", FIELDS)
+    backend.rows(table.path).extend(
+        [
+            {"OBJECTID": 1, "NAME": "a", "CREATED": datetime(2020, 1, 1)},
+            {"OBJECTID": 2, "NAME": None, "CREATED": None},
+        ]
+    )
+    return table
+
+@pytest.fixture
+def pacific_time(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available")
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+def test_esri_dates_are_utc_epoch_milliseconds(table, pacific_time):
+    buffer = io.StringIO()
+    assert table.dump_json(buffer, "esri") == 2
+    features = json.loads(buffer.getvalue())["features"]
+    assert features[0]["attributes"] == {"OBJECTID": 1, "NAME": "a", "CREATED": 1577836800000}
+    assert features[1]["attributes"] == {"OBJECTID": 2, "NAME": None, "CREATED": None}
+
+def test_geojson_dates_are_iso_strings(table):
+    buffer = io.StringIO()
+    assert table.dump_json(buffer, "ndjson") == 2
+    features = [json.loads(line) for line in buffer.getvalue().splitlines()]
+    assert features[0]["properties"]["CREATED"] == "2020-01-01T00:00:00"
+    assert features[1]["geometry"] is None
@@ -0,0 +1,67 @@
+import random
+
+from utils.models import OIDIndex, oid_predicates
+
+def test_unordered_input_builds_sorted_runs():
+    oids = [*range(1, 101), *range(200, 203), 500, 7]
+    random.Random(0).shuffle(oids)
+    for source in (oids, set(oids), frozenset(oids)):
+        index = OIDIndex(source)
+        assert list(index.ranges()) == [(1, 101), (200, 203), (500, 501)]
+        assert len(index) == 104
+
+def test_oid_predicates_from_selection_set():
+    selection = {10_007, 3, 1, 2, 10_005, *range(20, 40)}
+    assert list(oid_predicates("OBJECTID", selection)) == \
+        ["(OBJECTID BETWEEN 1 AND 3 OR OBJECTID BETWEEN 20 AND 39 OR OBJECTID IN (10005,10007))"]
+    assert list(oid_predicates("OBJECTID", selection, max_terms=2)) == \
+        [
+            "(OBJECTID BETWEEN 1 AND 3 OR OBJECTID BETWEEN 20 AND 39)",
+            "OBJECTID IN (10005,10007)",
+        ]
+
+def test_intersection_with_set():
+    index = OIDIndex(range(1, 11))
+    assert list(index & {9, 3, 5, 42}) == [3, 5, 9]
+    assert list(OIDIndex([9, 3]) & set(range(1, 100))) == [3, 9]
+
+def test_add_merges_runs():
+    index = OIDIndex()
+    for oid in (5, 1, 3, 2, 4, 4, 10, 8):
+        index.add(oid)
+    assert list(index.ranges()) == [(1, 6), (8, 9), (10, 11)]
+    assert len(index) == 7
+    index.add(9)
+    assert list(index.ranges()) == [(1, 6), (8, 11)]
+    assert len(index) == 8
+    assert 9 in index and 7 not in index and 0 not in index and "9" not in index
+
+def test_discard_splits_runs():
+    index = OIDIndex(range(1, 11))
+    index.discard(5)
+    index.discard(42)
+    assert list(index.ranges()) == [(1, 5), (6, 11)]
+    for oid in (1, 10, 6):
+        index.discard(oid)
+    assert list(index.ranges()) == [(2, 5), (7, 10)]
+    assert len(index) == 6
+    for oid in list(index):
+        index.discard(oid)
+    assert not index and list(index.ranges()) == []
+
+def test_between():
+    index = OIDIndex([1, 2, 3, 7, 8, 20])
+    assert list(index.between(3, 8)) == [3, 7, 8]
+    assert list(index.between(9, 19)) == []
+    assert list(index.between(0, 100)) == [1, 2, 3, 7, 8, 20]
+
+def test_predicates():
+    index = OIDIndex([1, 2, 3, 4, 7, 9, 10, 20, 21, 22])
+    assert index.predicate("OBJECTID") == "(OBJECTID BETWEEN 1 AND 4 OR OBJECTID BETWEEN 20 AND 22 OR OBJECTID IN (7,9,10))"
+    assert list(index.predicates("OBJECTID", max_terms=3)) == \
+        [
+            "(OBJECTID BETWEEN 1 AND 4 OR OBJECTID IN (7,9))",
+            "(OBJECTID BETWEEN 20 AND 22 OR OBJECTID IN (10))",
+        ]
+    assert list(OIDIndex().predicates("OBJECTID")) == ["1 = 0"]
+    assert OIDIndex([5]).predicate("OBJECTID") == "OBJECTID IN (5)"
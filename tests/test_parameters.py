@@ -0,0 +1,77 @@
+import arcpy
+import pytest
+
+from utils.archelp import Parameters
+
+class Parameter(arcpy.Parameter):
+    """ Parameter with only a name """
+    def __init__(self, name: str) -> None:
+        self.name = name
+        return
+
+    def __repr__(self) -> str:
+        return f"Parameter({self.name!r})"
+
+@pytest.fixture
+def parameters() -> Parameters:
+    return Parameters([Parameter("a"), Parameter("b"), Parameter("c")])
+
+def names(parameters: Parameters) -> list[str]:
+    return [parameter.name for parameter in parameters]
+
+def assert_indexed(parameters: Parameters) -> None:
+    for index, parameter in enumerate(parameters):
+        assert parameters[parameter.name] is parameter
+        assert getattr(parameters, parameter.name) is parameter
+        assert parameters[index] is parameter
+
+def test_access_by_name_index_and_attribute(parameters):
+    assert parameters.b is parameters["b"] is parameters[1]
+    assert "c" in parameters
+    with pytest.raises(AttributeError):
+        parameters.d
+
+def test_insert(parameters):
+    parameters.insert(0, Parameter("q"))
+    assert names(parameters) == ["q", "a", "b", "c"]
+    assert parameters.a.name == "a"
+    assert_indexed(parameters)
+
+def test_insert_existing_name_moves_parameter(parameters):
+    parameters.insert(0, Parameter("c"))
+    assert names(parameters) == ["c", "a", "b"]
+    assert_indexed(parameters)
+
+def test_removal(parameters):
+    assert parameters.pop(0).name == "a"
+    assert parameters.pop("c").name == "c"
+    assert names(parameters) == ["b"]
+    assert_indexed(parameters)
+    parameters.extend([Parameter("d"), Parameter("e")])
+    del parameters["b"]
+    parameters.remove(parameters.e)
+    assert names(parameters) == ["d"]
+    assert_indexed(parameters)
+    assert "b" not in parameters and "e" not in parameters
+    del parameters[0]
+    assert "d" not in parameters
+
+def test_reorder(parameters):
+    parameters.reverse()
+    assert names(parameters) == ["c", "b", "a"]
+    assert_indexed(parameters)
+    parameters.sort(key=lambda parameter: parameter.name)
+    assert names(parameters) == ["a", "b", "c"]
+    assert_indexed(parameters)
+    parameters[0:2] = [parameters.b, parameters.a]
+    assert names(parameters) == ["b", "a", "c"]
+    assert_indexed(parameters)
+
+def test_clear_and_iadd(parameters):
+    parameters.clear()
+    assert "a" not in parameters
+    parameters += [Parameter("x"), Parameter("x")]
+    assert names(parameters) == ["x"]
+    assert_indexed(parameters)
+    with pytest.raises(TypeError):
+        parameters *= 2
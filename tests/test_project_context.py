@@ -0,0 +1,55 @@
+import arcpy
+import pytest
+
+import utils.tool as tool
+from utils.tool import ProjectContext
+
+class FakeProject:
+    opened: list[str] = []
+    current = "C:/projects/a/a.aprx"
+
+    def __init__(self, path: str) -> None:
+        self.filePath = FakeProject.current
+        self.homeFolder = self.filePath.rsplit("/", 1)[0]
+        self.defaultGeodatabase = f"{self.homeFolder}/default.gdb"
+        self.databases = []
+        FakeProject.opened.append(self.filePath)
+        return
+
+@pytest.fixture
+def project(monkeypatch):
+    monkeypatch.setattr(arcpy.mp, "ArcGISProject", FakeProject, raising=False)
+    monkeypatch.setattr(FakeProject, "opened", [])
+    monkeypatch.setattr(FakeProject, "current", "C:/projects/a/a.aprx")
+    yield FakeProject
+    # Don't leave a fake project in the shared context
+    tool.PROJECT.invalidate()
+
+def test_project_is_shared_until_invalidated(project):
+    context = ProjectContext(ttl=60)
+    assert context.name == "a"
+    assert context.default_gdb == "C:/projects/a/default.gdb"
+    assert project.opened == ["C:/projects/a/a.aprx"]
+    project.current = "C:/projects/b/b.aprx"
+    assert context.name == "a"
+    context.invalidate()
+    assert context.name == "b"
+    assert context.default_gdb == "C:/projects/b/default.gdb"
+    assert project.opened == ["C:/projects/a/a.aprx", "C:/projects/b/b.aprx"]
+
+def test_project_is_read_again_after_ttl(project, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(tool.time, "monotonic", lambda: now[0])
+    context = ProjectContext(ttl=30)
+    assert context.file_path == "C:/projects/a/a.aprx"
+    project.current = "C:/projects/b/b.aprx"
+    now[0] += 29
+    assert context.file_path == "C:/projects/a/a.aprx"
+    now[0] += 2
+    assert context.file_path == "C:/projects/b/b.aprx"
+    assert len(project.opened) == 2
+
+def test_tools_share_the_process_context(project):
+    first, second = tool.Tool(), tool.Tool()
+    assert first.project_name == second.project_name == "a"
+    assert len(project.opened) == 1
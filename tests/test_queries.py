@@ -0,0 +1,126 @@
+import pytest
+
+import utils.models as models
+from utils.models import UpdateResult, as_rows
+
+from .fakes import FakeBackend, FakeField, install_cursors, make_table
+
+FIELDS = \
+    [
+        FakeField("OBJECTID", "OID", isNullable=False, editable=False),
+        FakeField("STATUS", "String", length=10),
+        FakeField("COUNT", "Integer"),
+    ]
+
+@pytest.fixture
+def backend(monkeypatch) -> FakeBackend:
+    backend = FakeBackend()
+    install_cursors(monkeypatch, backend)
+    return backend
+
+@pytest.fixture
+def table(backend):
+    table = make_table(backend, "/data/test.gdb/Tickets", FIELDS)
+    backend.rows(table.path).extend(
+        {"OBJECTID": oid, "STATUS": "OPEN" if oid % 2 else "CLOSED", "COUNT": oid}
+        for oid in range(1, 11)
+    )
+    table.__dict__["record_count"] = 10
+    return table
+
+def test_query_results_are_reused(table):
+    table.query = "STATUS = 'OPEN'"
+    assert len(table) == 5
+    table.query = "STATUS = 'CLOSED'"
+    assert len(table) == 5
+    table.query = "STATUS = 'OPEN'"
+    assert len(table.queries._results) == 2
+    assert list(table["OBJECTID"]) == [1, 3, 5, 7, 9]
+
+def test_setitem_drops_stale_query_results(table):
+    table.query = "STATUS = 'OPEN'"
+    assert len(table) == 5
+    table[1] = {"OBJECTID": 1, "STATUS": "CLOSED", "COUNT": 1}
+    assert len(table) == 4
+    with pytest.raises(KeyError):
+        table[1]
+
+def test_update_rows_drops_stale_query_results(table):
+    table.query = "STATUS = 'OPEN'"
+    assert len(table) == 5
+    assert table.update_rows({3: {"STATUS": "CLOSED"}, 5: {"STATUS": "CLOSED"}}).updated == 2
+    assert len(table) == 3
+    del table.query
+    assert len(table) == 10
+
+def test_insert_and_delete_are_tracked(table):
+    table.query = "STATUS = 'OPEN'"
+    assert len(table) == 5
+    del table[1]
+    assert len(table) == 4
+    with table.insert_cursor(["STATUS", "COUNT"]) as cursor:
+        cursor.insertRow(("OPEN", 11))
+    assert len(table) == 5
+    del table.query
+    assert len(table) == 10
+
+def test_missing_row_raises_key_error(backend, table):
+    # The OID is in the cached result but the row was removed outside of the table cursors
+    table.query = "STATUS = 'OPEN'"
+    assert len(table) == 5
+    rows = backend.rows(table.path)
+    rows.remove(next(row for row in rows if row["OBJECTID"] == 1))
+    with pytest.raises(KeyError):
+        table[1]
+
+def test_update_rows_from_rows(backend, table):
+    with table.search_cursor(["OID@", "STATUS", "COUNT"], where_clause="STATUS = 'OPEN'") as cursor:
+        rows = [row for row in as_rows(cursor) if row["OID@"] > 5]
+    with table.search_cursor(["OBJECTID", "COUNT"], where_clause="OBJECTID IN (2,4)") as cursor:
+        rows.extend(as_rows(cursor))
+    assert table.update_rows(rows).updated == 4
+    assert table.update_rows({oid: {"COUNT": 0} for oid in (1, 9, 10, 42)}) == UpdateResult(3, 1)
+    assert [row["COUNT"] for row in backend.rows(table.path)] == [0, 2, 3, 4, 5, 6, 7, 8, 0, 0]
+
+def test_update_rows_reads_only_requested_oids(monkeypatch, table):
+    where_clauses = []
+    cursor = models.UpdateCursor
+    def update_cursor(path, fields, where_clause=None, **kwargs):
+        where_clauses.append(where_clause)
+        return cursor(path, fields, where_clause=where_clause, **kwargs)
+    monkeypatch.setattr(models, "UpdateCursor", update_cursor)
+    assert table.update_rows({1: {"COUNT": 0}, 10: {"COUNT": 0}}, commit_every=1).updated == 2
+    assert where_clauses == ["OBJECTID IN (1)", "OBJECTID IN (10)"]
+
+def test_cursor_where_clause_reuses_compiled_query(monkeypatch, table):
+    table.oid_filter = [1, 2, 3, 4, 7]
+    compiled = []
+    predicates = models.OIDIndex.predicates
+    def count_predicates(self, field, max_terms=None):
+        compiled.append(field)
+        return predicates(self, field, max_terms)
+    monkeypatch.setattr(models.OIDIndex, "predicates", count_predicates)
+    for _ in range(3):
+        with table.search_cursor(["OID@"], where_clause="STATUS = 'OPEN'") as cursor:
+            assert [oid for oid, in cursor] == [1, 3, 7]
+    assert len(compiled) == 1
+
+def test_large_oid_filter_is_read_in_multiple_passes(monkeypatch, backend, table):
+    rows = backend.rows(table.path)
+    rows.extend({"OBJECTID": oid, "STATUS": "OPEN", "COUNT": oid} for oid in range(11, 3001))
+    table.__dict__["record_count"] = 3000
+    where_clauses = []
+    update = models.UpdateCursor
+    def update_cursor(path, fields, where_clause=None, **kwargs):
+        where_clauses.append(where_clause)
+        return update(path, fields, where_clause=where_clause, **kwargs)
+    monkeypatch.setattr(models, "UpdateCursor", update_cursor)
+    # Every other OID, so each OID is its own IN list term
+    table.oid_filter = range(1, 3001, 2)
+    assert len(table) == 1500
+    with table.update_cursor(["OID@", "COUNT"]) as cursor:
+        for oid, _ in cursor:
+            cursor.updateRow((oid, 0))
+    assert len(where_clauses) == 2
+    assert sum(1 for row in rows if row["COUNT"] == 0) == 1500
+    assert all(row["COUNT"] == 0 for row in rows if row["OBJECTID"] % 2)
@@ -0,0 +1,40 @@
+import json
+import sys
+
+import pytest
+
+from utils.reloader import LazyTool, import_tools
+
+from .bench_import_tools import PACKAGE, loaded_tools, unload_tools, write_tools
+
+@pytest.fixture
+def tool_dict(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    tool_dict = write_tools(tmp_path, 3, eager=("Tool2",))
+    unload_tools()
+    yield tool_dict
+    unload_tools()
+
+def test_lazy_tools_are_listed_from_the_manifest(tool_dict, tmp_path):
+    manifest = tmp_path / "tool_manifest.json"
+    first = import_tools(tool_dict, PACKAGE, lazy=True, manifest=manifest)
+    assert not any(issubclass(tool, LazyTool) for tool in first)
+    entries = json.loads(manifest.read_text())
+    assert entries[f"{PACKAGE}.tools.Tool1"]["label"] == "Tool1"
+    assert entries[f"{PACKAGE}.tools.Tool2"] == {"lazy_load": False, "mtime": entries[f"{PACKAGE}.tools.Tool2"]["mtime"]}
+
+    unload_tools()
+    second = import_tools(tool_dict, PACKAGE, lazy=True, manifest=manifest)
+    assert [issubclass(tool, LazyTool) for tool in second] == [True, False, True]
+    # Only the tool with a runtime label was imported
+    assert loaded_tools() == 1 and f"{PACKAGE}.tools.Tool2" in sys.modules
+    assert second[0]().label == "Tool1"
+
+def test_manifest_is_not_rewritten_for_eager_tools(tool_dict, tmp_path):
+    manifest = tmp_path / "tool_manifest.json"
+    import_tools(tool_dict, PACKAGE, lazy=True, manifest=manifest)
+    # The manifest is replaced (new inode) whenever it is written
+    written = manifest.stat().st_ino
+    unload_tools()
+    import_tools(tool_dict, PACKAGE, lazy=True, manifest=manifest)
+    assert manifest.stat().st_ino == written
@@ -0,0 +1,55 @@
+import subprocess
+import threading
+
+import pytest
+
+from tools.utilities import VersionControl
+from tools.utilities.VersionControl import GitState
+
+class FakeGit:
+    """ git_subprocess replacement, 'status' blocks until released when block is set """
+    def __init__(self) -> None:
+        self.status = "before pull"
+        self.block = threading.Event()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        return
+
+    def __call__(self, command, flag, cwd=None) -> subprocess.CompletedProcess:
+        if command == "pull":
+            self.status = "after pull"
+            return subprocess.CompletedProcess(["git", command], 0, "Updated", "")
+        status = self.status
+        if self.block.is_set():
+            self.block.clear()
+            self.started.set()
+            self.release.wait(5)
+        return subprocess.CompletedProcess(["git", command], 0, status, "")
+
+@pytest.fixture
+def git(monkeypatch) -> FakeGit:
+    git = FakeGit()
+    monkeypatch.setattr(VersionControl, "git_subprocess", git)
+    return git
+
+def test_status_read_after_pull_is_not_overwritten(git, tmp_path):
+    state = GitState(tmp_path, status_ttl=0)
+    assert state.status == "before pull"
+    # A background refresh reads the status before the pull and finishes after it
+    git.block.set()
+    state.refresh_status()
+    assert git.started.wait(5)
+    git("pull", None)
+    state.invalidate()
+    assert state.read_status() == "after pull"
+    git.release.set()
+    state._status_thread.join(5)
+    assert state._status == "after pull"
+
+def test_stale_status_is_refreshed_in_the_background(git, tmp_path):
+    state = GitState(tmp_path, status_ttl=0)
+    assert state.status == "before pull"
+    git.status = "changed"
+    assert state.status == "before pull"
+    state._status_thread.join(5)
+    assert state.status == "changed"
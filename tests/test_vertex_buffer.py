@@ -0,0 +1,29 @@
+import numpy as np
+
+from tools.production import VertexBuffer
+from tools.production.VertexBuffer import circle_ring, dissolve_rows, tree_union, vertex_indexes, wkb_circles
+
+from .bench_vertex_buffer import StubPolygon
+
+class EmptyGeometry(StubPolygon):
+    """ Geometry that is falsy (like an empty arcpy geometry) but still has to be unioned """
+    def __bool__(self) -> bool:
+        return False
+
+def test_tree_union_keeps_falsy_geometries():
+    square = StubPolygon(np.array([[0, 0], [0, 1], [1, 1], [1, 0], [0, 0]], dtype=float))
+    point = EmptyGeometry(np.array([[5.0, 5.0]]))
+    union = tree_union([square, point, square])
+    assert [5.0, 5.0] in union.points.tolist()
+    assert tree_union([point]) is point
+
+def test_dissolve_rows_groups_by_source_oid(monkeypatch):
+    monkeypatch.setattr(VertexBuffer.arcpy, "FromWKB", StubPolygon.from_wkb, raising=False)
+    xy = np.array([[0, 0], [5, 0], [10, 0], [100, 100], [105, 100]], dtype=float)
+    oids = np.array([1, 1, 1, 2, 2])
+    assert vertex_indexes(oids).tolist() == [0, 1, 2, 0, 1]
+    rows = zip(wkb_circles(xy, 10.0, circle_ring(16)), oids.tolist(), vertex_indexes(oids).tolist())
+    dissolved = list(dissolve_rows(rows, None))
+    assert [(oid, vertex) for _, oid, vertex in dissolved] == [(1, None), (2, None)]
+    extent = dissolved[0][0].points
+    assert extent[:, 0].min() == -10.0 and extent[:, 0].max() == 20.0
@@ -1,12 +1,27 @@
 import arcpy
+import os
+import sys
+import pickle
+import multiprocessing
 from arcpy import Parameter
+from itertools import islice
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from tempfile import TemporaryDirectory, mkstemp
+from typing import Generator, Literal
 
 from utils.tool import Tool
-from utils.models import Table, Workspace
+from utils.models import Table, Workspace, SchemaCache, workspace_stamp
 import utils.archelp as archelp
-from utils.archelp import print, Parameters
+from utils.archelp import print, Parameters, ParameterCache, ThrottledProgressor
+
+# Number of source rows read into memory at a time when appending with cursors
+DEFAULT_CHUNK_SIZE = 10_000
 
 class GDBMerger(Tool):
+    # Kept between updateParameters calls (Pro may create a new tool instance for each call)
+    parameter_cache = ParameterCache()
+    
     def __init__(self):
         super().__init__()
         
@@ -64,14 +79,37 @@ class GDBMerger(Tool):
         )
         tables_to_merge.filter.type = "ValueList"
         
-        return [input_gdbs, target_gdb, strict_merge, features_to_merge, tables_to_merge]
+        chunk_size = Parameter(
+            displayName="Rows per Chunk",
+            name="chunk_size",
+            datatype="GPLong",
+            parameterType="Optional",
+            direction="Input",
+            category="Performance",
+        )
+        chunk_size.value = DEFAULT_CHUNK_SIZE
+        
+        # Read input geodatabases in worker processes (0 merges sequentially)
+        workers = Parameter(
+            displayName="Parallel Workers",
+            name="workers",
+            datatype="GPLong",
+            parameterType="Optional",
+            direction="Input",
+            category="Performance",
+        )
+        workers.value = 0
+        
+        return [input_gdbs, target_gdb, strict_merge, features_to_merge, tables_to_merge, chunk_size, workers]
     
     def updateParameters(self, parameters: list[Parameter]) -> None:
         parameters = Parameters(parameters)
         if parameters.target_gdb.value and parameters.target_gdb.altered:
-            wsp = Workspace(parameters.target_gdb.valueAsText)
-            parameters.features_to_merge.filter.list = list(wsp.featureclasses)
-            parameters.tables_to_merge.filter.list = list(wsp.tables)
+            # The workspace is only listed again when the target or its contents change
+            path = parameters.target_gdb.valueAsText
+            featureclasses, tables = self.parameter_cache.cached((path, workspace_stamp(path)), lambda: list_workspace(path))
+            parameters.features_to_merge.filter.list = featureclasses
+            parameters.tables_to_merge.filter.list = tables
         return
     
     def execute(self, parameters: list[Parameter], messages: list[object]) -> None:
@@ -93,21 +131,59 @@ class GDBMerger(Tool):
                                           featureclass_filter=features_to_merge, 
                                           table_filter=tables_to_merge)
         strict_merge: bool = parameters.strict_merge.value
+        chunk_size: int = parameters.chunk_size.value or DEFAULT_CHUNK_SIZE
+        workers: int = parameters.workers.value or 0
+        # The target schema is only needed to check inputs in strict mode
+        schema_cache: SchemaCache = None
+        target_schema: dict[str, str] = None
+        if strict_merge:
+            schema_cache = SchemaCache()
+            target_schema = schema_cache.fingerprints(target_gdb.path,
+                                                      featureclass_filter=features_to_merge,
+                                                      table_filter=tables_to_merge)
         arcpy.ResetProgressor()
         
-        for gdb_idx, input_gdb in enumerate(input_gdbs, start=1):
-            arcpy.SetProgressor("step", "Reading Next Input Schema", gdb_idx, len(input_gdbs), 1)
-            input_gdb = Workspace(arcpy.Describe(input_gdb).catalogPath, 
-                                  featureclass_filter=features_to_merge, 
-                                  table_filter=tables_to_merge)
+        input_paths: list[str] = [arcpy.Describe(input_gdb).catalogPath for input_gdb in input_gdbs]
+        if workers > 0:
+            if strict_merge:
+                # Drop inputs that can be rejected from the schema cache before spawning workers
+                input_paths = \
+                    [
+                        path for path in input_paths
+                        if cached_strict_check(schema_cache, path, target_schema,
+                                               featureclass_filter=features_to_merge,
+                                               table_filter=tables_to_merge) is not False
+                    ]
+            merge_parallel(input_paths, target_gdb, strict_merge,
+                           features_to_merge=features_to_merge,
+                           tables_to_merge=tables_to_merge,
+                           chunk_size=chunk_size,
+                           workers=workers)
+            return
+        
+        for gdb_idx, input_path in enumerate(input_paths, start=1):
+            arcpy.SetProgressor("step", "Reading Next Input Schema", gdb_idx, len(input_paths), 1)
             
             # Abide by strict merge rules on a per-geodatabase basis
-            if not (target_gdb == input_gdb) and strict_merge:
-                strict_merge_warning(input_gdb, target_gdb)
-                continue
+            # The schema cache accepts or rejects unchanged geodatabases without opening them
+            exact_match = False
+            if strict_merge:
+                exact_match = cached_strict_check(schema_cache, input_path, target_schema,
+                                                  featureclass_filter=features_to_merge,
+                                                  table_filter=tables_to_merge)
+                if exact_match is False:
+                    continue
+            
+            input_gdb = Workspace(input_path, 
+                                  featureclass_filter=features_to_merge, 
+                                  table_filter=tables_to_merge)
             
             print(f"Merging {input_gdb.name} into {target_gdb.name}")
-            to_merge = input_gdb & target_gdb
+            # Same order as stage_gdb so sequential and parallel merges write the target identically
+            to_merge = sorted(input_gdb & target_gdb)
+            # Read the schemas and counts of the remaining tables while earlier tables are merged
+            input_gdb.prefetch(to_merge)
+            target_gdb.prefetch(to_merge)
             for tbl_idx, table in enumerate(to_merge, start=1):
                 source: Table = input_gdb[table]
                 target: Table = target_gdb[table]
@@ -119,7 +195,7 @@ class GDBMerger(Tool):
                 print(f"\t{source.name} {tbl_idx}/{len(to_merge)}: {len(source)} rows")
                 
                 # Abide by strict merge rules on a per-table basis
-                if not source == target and strict_merge:
+                if strict_merge and not exact_match and not source == target:
                     strict_merge_warning(source, target)
                     continue
                 
@@ -127,7 +203,7 @@ class GDBMerger(Tool):
                 # Append rows from source to target
                 arcpy.SetProgressorLabel(f"Appending {source.name} to {target.name}")
                 try:
-                    merge_tables(source, target, matching_fields)
+                    merge_tables(source, target, matching_fields, chunk_size=chunk_size)
                 except Exception as e:
                     print(f"\t\t{source.name} failed to merge: {e}", severity="ERROR")
                     continue
@@ -135,24 +211,255 @@ class GDBMerger(Tool):
             arcpy.SetProgressorPosition()
         return
 
-def merge_tables(source: Table, target: Table, matching_fields: list[str]):
+def list_workspace(path: str) -> tuple[list[str], list[str]]:
+    """ Featureclass and table names of a workspace """
+    wsp = Workspace(path, lazy=True)
+    return list(wsp.featureclasses), list(wsp.tables)
+
+def merge_tables(source: Table, target: Table, matching_fields: list[str], *, 
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, 
+                 progress_rows: int = DEFAULT_CHUNK_SIZE, 
+                 progress_seconds: float = 1.0):
+    """ Append the matching fields of source to target
+    
+    If the schemas match exactly the rows are appended with arcpy.management.Append
+    so the copy happens inside the geodatabase. Otherwise the source rows are streamed 
+    in chunks of chunk_size into an insert cursor on the target, and the progressor label 
+    is only updated every progress_rows rows or progress_seconds seconds.
+    """
+    if schemas_match(source, target):
+        arcpy.management.Append(source.path, target.path, schema_type="TEST")
+        # Rows were written outside of the table cursors
+        target._updated = True
+        return
+    
+    progress = ThrottledProgressor(
+        f"Appending {source.name} to {target.name}", 
+        total=len(source), 
+        every_rows=progress_rows, 
+        every_seconds=progress_seconds)
     # Start an edit session on the target table
     with target.editor:
         # Get the target table's insert cursor
         with target.insert_cursor(matching_fields) as cursor:
             # Get the source table's search cursor
             with source.search_cursor(matching_fields) as rows:
-                # Append each row from the source table to the target table
-                for row_idx, row in enumerate(rows, start=1):
+                # Append the source rows to the target table one chunk at a time
+                appended = 0
+                while chunk := list(islice(rows, chunk_size)):
+                    for row in chunk:
+                        cursor.insertRow(row)
+                    appended += len(chunk)
+                    progress.update(appended)
+    progress.finish()
+    return
+
+def schemas_match(source: Table, target: Table) -> bool:
+    """ Check if the field names, types and lengths (and shape type) of two tables are identical """
+    return source.fingerprint == target.fingerprint
+
+def cached_strict_check(schema_cache: SchemaCache, input_path: str, target_schema: dict[str, str], 
+                        **filters: list[str]) -> bool | None:
+    """ Strict merge check of a whole input geodatabase using only the schema cache
+    
+    target_schema: child fingerprints of the target (see SchemaCache.fingerprints)
+    filters: featureclass_filter and table_filter used for the target
+    
+    Returns True if every child matches the target schema exactly, False if the input 
+    has to be rejected (warnings are printed) and None if the tables have to be checked individually
+    """
+    input_schema = schema_cache.fingerprints(input_path, **filters)
+    if tuple(input_schema) != tuple(target_schema):
+        name = os.path.basename(input_path)
+        missing = target_schema.keys() - input_schema.keys()
+        additional = input_schema.keys() - target_schema.keys()
+        for message, severity in schema_warnings(name, missing, additional):
+            print(message, severity=severity)
+        return False
+    if input_schema == target_schema:
+        return True
+    return None
+
+@dataclass
+class StagedTable:
+    """ Rows of one input table read by a worker process """
+    name: str
+    fields: list[str]
+    count: int
+    path: str = None
+    append_from: str = None
+
+@dataclass
+class StagedGDB:
+    """ Result of staging one input geodatabase in a worker process """
+    path: str
+    name: str
+    rejected: bool = False
+    tables: list[StagedTable] = field(default_factory=list)
+    messages: list[tuple[str, Literal['INFO', 'WARNING', 'ERROR'] | None]] = field(default_factory=list)
+
+def stage_gdb(gdb_path: str, 
+              target_schema: dict[str, tuple[list[str], str]], 
+              strict_merge: bool, 
+              staging_dir: str, 
+              *,
+              features_to_merge: list[str] = None,
+              tables_to_merge: list[str] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> StagedGDB:
+    """ Read the tables of an input geodatabase that should be merged into staging files
+    
+    This runs in a worker process and only reads from the input. Messages are collected
+    and returned so the main process can print them in input order. Tables that exactly 
+    match the target schema are not staged and are appended directly by the writer.
+    
+    gdb_path: catalog path of the input geodatabase
+    target_schema: {table name: (target fieldnames, target fingerprint)} in target order
+    staging_dir: directory the staging files are written to
+    """
+    input_gdb = Workspace(gdb_path, featureclass_filter=features_to_merge, table_filter=tables_to_merge)
+    staged = StagedGDB(gdb_path, input_gdb.name)
+    
+    # Abide by strict merge rules on a per-geodatabase basis
+    children = set(input_gdb.featureclasses) | set(input_gdb.tables)
+    if strict_merge and (*input_gdb.featureclasses, *input_gdb.tables) != tuple(target_schema):
+        missing = set(target_schema) - children
+        additional = children - set(target_schema)
+        staged.messages.extend(schema_warnings(input_gdb.name, missing, additional))
+        staged.rejected = True
+        return staged
+    
+    to_merge = sorted(children & set(target_schema))
+    for tbl_idx, table in enumerate(to_merge, start=1):
+        source: Table = input_gdb[table]
+        target_fields, target_fingerprint = target_schema[table]
+        count = len(source)
+        if count == 0:
+            staged.messages.append((f"\t{source.name} has no rows to merge! ⛔", None))
+            continue
+        
+        staged.messages.append((f"\t{source.name} {tbl_idx}/{len(to_merge)}: {count} rows", None))
+        
+        # Abide by strict merge rules on a per-table basis
+        if strict_merge and source.fieldnames != target_fields:
+            missing = set(target_fields) - set(source.fieldnames)
+            additional = set(source.fieldnames) - set(target_fields)
+            staged.messages.extend(schema_warnings(source.name, missing, additional))
+            continue
+        
+        matching_fields = [field for field in source.fieldnames if field in target_fields]
+        if source.fingerprint == target_fingerprint:
+            staged.tables.append(StagedTable(table, matching_fields, count, append_from=source.path))
+            continue
+        
+        # Geometry objects are staged as Esri JSON so the rows can be pickled
+        staged_fields = ["SHAPE@JSON" if field == "SHAPE@" else field for field in matching_fields]
+        handle, staging_file = mkstemp(suffix=".pkl", dir=staging_dir)
+        with open(handle, "wb") as staging, source.search_cursor(staged_fields) as rows:
+            while chunk := list(islice(rows, chunk_size)):
+                pickle.dump(chunk, staging, protocol=pickle.HIGHEST_PROTOCOL)
+        staged.tables.append(StagedTable(table, staged_fields, count, path=staging_file))
+    return staged
+
+def read_staged(staged: StagedTable) -> Generator[list[tuple], None, None]:
+    """ Yield the chunks of rows written to a staging file by stage_gdb """
+    with open(staged.path, "rb") as staging:
+        while True:
+            try:
+                yield pickle.load(staging)
+            except EOFError:
+                return
+
+def commit_staged(staged: StagedTable, target: Table, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """ Write a staged table into the target (only called by the single writer process) """
+    if staged.append_from:
+        arcpy.management.Append(staged.append_from, target.path, schema_type="TEST")
+        target._updated = True
+        return
+    
+    progress = ThrottledProgressor(f"Appending {staged.name} to {target.name}", total=staged.count, every_rows=chunk_size)
+    with target.editor:
+        with target.insert_cursor(staged.fields) as cursor:
+            appended = 0
+            for chunk in read_staged(staged):
+                for row in chunk:
                     cursor.insertRow(row)
-                    arcpy.SetProgressorLabel(f"Appending {source.name} to {target.name} ({row_idx}/{len(source)})")
+                appended += len(chunk)
+                progress.update(appended)
+    progress.finish()
     return
 
-def strict_merge_warning(source: Table | Workspace, target: Table | Workspace):
-    missing = target - source
-    additional = source - target
-    print(f"\t\t{source.name} does not match target schema", severity="WARNING")
+def merge_parallel(input_paths: list[str], target_gdb: Workspace, strict_merge: bool, *,
+                   features_to_merge: list[str] = None,
+                   tables_to_merge: list[str] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   workers: int = 1) -> None:
+    """ Merge the input geodatabases into the target with a process pool
+    
+    Input schemas and rows are read by up to workers processes and staged to a temporary 
+    directory. The main process is the only writer, it commits the staged tables in the 
+    order of input_paths so the output order is the same as a sequential merge and
+    all edits to the target happen in this process's edit sessions.
+    """
+    target_schema = \
+        {
+            table: (target_gdb[table].fieldnames, target_gdb[table].fingerprint)
+            for table in (*target_gdb.featureclasses, *target_gdb.tables)
+        }
+    with TemporaryDirectory(prefix="gdbmerge_") as staging_dir, \
+         ProcessPoolExecutor(max_workers=workers, mp_context=pool_context()) as pool:
+        futures = \
+            [
+                pool.submit(stage_gdb, path, target_schema, strict_merge, staging_dir,
+                            features_to_merge=features_to_merge,
+                            tables_to_merge=tables_to_merge,
+                            chunk_size=chunk_size)
+                for path in input_paths
+            ]
+        # Results are committed in submission order, not completion order
+        for gdb_idx, future in enumerate(futures, start=1):
+            arcpy.SetProgressor("step", "Writing Staged Geodatabase", gdb_idx, len(futures), 1)
+            try:
+                staged = future.result()
+            except Exception as e:
+                print(f"{input_paths[gdb_idx-1]} failed to stage: {e}", severity="ERROR")
+                continue
+            if not staged.rejected:
+                print(f"Merging {staged.name} into {target_gdb.name}")
+            for message, severity in staged.messages:
+                print(message, severity=severity)
+            for table in staged.tables:
+                target: Table = target_gdb[table.name]
+                arcpy.SetProgressorLabel(f"Appending {table.name} to {target.name}")
+                try:
+                    commit_staged(table, target, chunk_size=chunk_size)
+                except Exception as e:
+                    print(f"\t\t{table.name} failed to merge: {e}", severity="ERROR")
+                    continue
+                finally:
+                    if table.path:
+                        os.remove(table.path)
+                print(f"\t\t{table.name} merged successfully ✔️ ({table.count} rows)")
+            arcpy.SetProgressorPosition()
+    return
+
+def pool_context() -> multiprocessing.context.BaseContext:
+    """ Spawn context for worker processes
+    Inside ArcGIS Pro sys.executable is ArcGISPro.exe, so workers are pointed at the environment python
+    """
+    context = multiprocessing.get_context("spawn")
+    if os.path.basename(sys.executable).lower().startswith("arcgispro"):
+        context.set_executable(os.path.join(sys.exec_prefix, "python.exe"))
+    return context
+
+def schema_warnings(name: str, missing: set[str], additional: set[str]) -> list[tuple[str, str]]:
+    """ Strict merge warnings as (message, severity) pairs """
+    warnings = [(f"\t\t{name} does not match target schema", "WARNING")]
     if missing:
-        print(f"\t\t\tMissing from {source.name}:\n{missing}", severity="WARNING")
+        warnings.append((f"\t\t\tMissing from {name}:\n{list(missing)}", "WARNING"))
     if additional:
-        print(f"\t\t\tAdditional in {source.name}:\n{additional}", severity="WARNING")
\ No newline at end of file
+        warnings.append((f"\t\t\tAdditional in {name}:\n{list(additional)}", "WARNING"))
+    return warnings
+
+def strict_merge_warning(source: Table | Workspace, target: Table | Workspace):
+    for message, severity in schema_warnings(source.name, target - source, source - target):
+        print(message, severity=severity)
\ No newline at end of file
@@ -1,9 +1,20 @@
 import arcpy
+import os
+import numpy as np
+from itertools import islice, groupby, zip_longest, chain
+from typing import Generator, Iterable
 
 from utils.tool import Tool
 import utils.archelp as archelp
 import utils.models as models
 
+# Number of segments used to approximate a circle in the vectorized engine
+CIRCLE_SEGMENTS = 64
+# Number of buffers generated and written at a time
+BATCH_SIZE = 50_000
+# Output geometry, source feature OID and source vertex index
+OUTPUT_FIELDS = ["SHAPE@", "SRC_OID", "VERTEX_IDX"]
+
 class VertexBuffer(Tool):
     
     def __init__(self) -> None:
@@ -49,7 +60,27 @@ class VertexBuffer(Tool):
             direction="Input"
         )
         
-        return [features, distance, suffix, per_vertex]
+        # Buffer vertices as NumPy circle approximations instead of arcpy geometries
+        vectorized = arcpy.Parameter(
+            displayName="Vectorized (Per Vertex or Point Features)",
+            name="vectorized",
+            datatype="GPBoolean",
+            parameterType="Optional",
+            direction="Input"
+        )
+        vectorized.value = False
+        
+        # Union the buffers of each source feature into a single output feature
+        dissolve = arcpy.Parameter(
+            displayName="Dissolve Per Feature",
+            name="dissolve",
+            datatype="GPBoolean",
+            parameterType="Optional",
+            direction="Input"
+        )
+        dissolve.value = False
+        
+        return [features, distance, suffix, per_vertex, vectorized, dissolve]
     
     def updateParameters(self, parameters: list) -> None:
         params = archelp.Parameters(parameters)
@@ -68,27 +99,10 @@ class VertexBuffer(Tool):
         
         per_vertex = params.per_vertex.value
                 
-        selection = params.features.value.getSelectionSet()
-        if not selection:
-            selection = None
-        definition_query = params.features.value.definitionQuery
-        if not definition_query:
-            definition_query = None
-        
-        features: models.FeatureClass = models.FeatureClass(arcpy.Describe(params.features.valueAsText).catalogPath)
-
-        if selection and definition_query:
-            ids = [str(i) for i in selection]
-            selection_query = f"{features.OIDField} IN ({','.join(ids)})"
-            query = f"{definition_query} AND {selection_query}"
-        elif selection:
-            ids = [str(i) for i in selection]
-            query = f"{features.OIDField} IN ({','.join(ids)})"
-        elif definition_query:
-            query = definition_query
-        else:
-            query = None
-                    
+        features: models.FeatureClass = models.FeatureClass(arcpy.Describe(params.features.valueAsText).catalogPath, lazy=True)
+        # Large selections are read in multiple passes of compressed OID ranges
+        where_clauses = list(models.layer_clauses(params.features.value, oid_field=features.OIDField))
+        
         feature_units = features.spatialReference.linearUnitName.replace("_", "")
         
         distance, units = params.distance.valueAsText.split(" ")
@@ -97,29 +111,147 @@ class VertexBuffer(Tool):
         
         suffix = params.suffix.valueAsText
         
-        buffers: list[arcpy.Polygon] = []
+        out_path = f"{features.path}{suffix}"
+        create_output(features, out_path)
+        
+        if params.vectorized.value and (per_vertex or features.shapeType in ("Point", "Multipoint")):
+            rows = chain.from_iterable(
+                vectorized_buffer_rows(features, distance*conversion, where_clause=where_clause)
+                for where_clause in where_clauses)
+            shape_token = "SHAPE@WKB"
+        else:
+            rows = chain.from_iterable(
+                buffer_rows(features, distance*conversion, per_vertex, where_clause=where_clause)
+                for where_clause in where_clauses)
+            shape_token = "SHAPE@"
+        
+        if params.dissolve.value:
+            rows = dissolve_rows(rows, features.spatialReference)
+            shape_token = "SHAPE@"
         
-        total = len(features)
-        index = 0
-        arcpy.SetProgressor("step", "Buffering Features", index, total, 1)
-        for feature in features.get_rows(["SHAPE@"], where_clause=query):
-            index += 1
+        # Buffers are written as they are created so memory use does not grow with the input
+        with arcpy.da.InsertCursor(out_path, [shape_token, *OUTPUT_FIELDS[1:]]) as cursor:
+            while batch := list(islice(rows, BATCH_SIZE)):
+                for row in batch:
+                    cursor.insertRow(row)
+        return
+
+def create_output(features: models.FeatureClass, out_path: str) -> None:
+    """ Create the output polygon featureclass with the source OID and vertex index fields """
+    out_workspace, out_name = os.path.split(out_path)
+    arcpy.management.CreateFeatureclass(out_workspace, out_name, "POLYGON", spatial_reference=features.spatialReference)
+    arcpy.management.AddFields(out_path, [[field, "LONG"] for field in OUTPUT_FIELDS[1:]])
+    return
+
+def buffer_rows(features: models.FeatureClass, radius: float, per_vertex: bool, *,
+                where_clause: str = None) -> Generator[tuple[arcpy.Polygon, int, int | None], None, None]:
+    """ Yield (buffer, source OID, vertex index) rows for each feature or each feature vertex 
+    The vertex index is None when whole features are buffered
+    """
+    progress = archelp.ThrottledProgressor("Buffering Features", total=len(features), every_rows=1000)
+    with features.search_cursor(["OID@", "SHAPE@"], where_clause=where_clause) as cursor:
+        for index, (oid, feature) in enumerate(cursor, start=1):
             try:
-                feature: arcpy.Geometry = feature[0]
-                if per_vertex and features.shapeType != "PointGeometry":
+                feature: arcpy.Geometry
+                if per_vertex and features.shapeType != "Point":
+                    vertex_idx = 0
                     for part in feature:
                         for point in part:
                             point = arcpy.PointGeometry(point, spatial_reference=features.spatialReference)
-                            buffer = point.buffer(distance*conversion)
-                            buffers.append(buffer)
+                            yield point.buffer(radius), oid, vertex_idx
+                            vertex_idx += 1
                 else:
-                    buffer = feature.buffer(distance*conversion)
-                    buffers.append(buffer)
+                    yield feature.buffer(radius), oid, None
             except Exception as e:
                 arcpy.AddWarning(f"Error buffering feature: {e}\n{feature.JSON}")
-            arcpy.SetProgressorPosition()
-            arcpy.SetProgressorLabel(f"Buffering Features {index}/{total}")
-            
-        arcpy.CopyFeatures_management(buffers, f"{features.path}{suffix}")
-        
-        return
\ No newline at end of file
+            progress.update(index)
+    progress.finish()
+    return
+
+def circle_ring(segments: int = CIRCLE_SEGMENTS) -> np.ndarray:
+    """ Closed clockwise ring of unit circle offsets with shape (segments + 1, 2) """
+    theta = np.linspace(0, -2*np.pi, segments + 1)
+    ring = np.column_stack((np.cos(theta), np.sin(theta)))
+    ring[-1] = ring[0]
+    return ring
+
+def wkb_circles(xy: np.ndarray, radius: float, ring: np.ndarray) -> Generator[bytes, None, None]:
+    """ Yield WKB polygons of the ring scaled by radius and centered on each point of xy (shape (n, 2)) """
+    # Little endian WKB Polygon with a single ring
+    wkb = np.dtype(
+        [
+            ("order", "u1"),
+            ("type", "<u4"),
+            ("rings", "<u4"),
+            ("points", "<u4"),
+            ("coords", "<f8", ring.shape),
+        ]
+    )
+    polygons = np.empty(len(xy), dtype=wkb)
+    polygons["order"] = 1
+    polygons["type"] = 3
+    polygons["rings"] = 1
+    polygons["points"] = len(ring)
+    polygons["coords"] = xy[:, None, :] + radius*ring[None, :, :]
+    buffer = polygons.tobytes()
+    size = wkb.itemsize
+    for offset in range(0, len(buffer), size):
+        yield buffer[offset:offset+size]
+
+def vectorized_buffer_rows(features: models.FeatureClass, radius: float, *,
+                           where_clause: str = None, 
+                           segments: int = CIRCLE_SEGMENTS, 
+                           batch_size: int = BATCH_SIZE) -> Generator[tuple[bytes, int, int], None, None]:
+    """ Yield (WKB buffer, source OID, vertex index) rows for every vertex of features
+    
+    Vertices are read in bulk with FeatureClassToNumPyArray and the circles (radius in 
+    feature units) are generated with NumPy batch_size vertices at a time.
+    """
+    vertices = arcpy.da.FeatureClassToNumPyArray(
+        features.path, 
+        ["OID@", "SHAPE@X", "SHAPE@Y"], 
+        where_clause=where_clause, 
+        explode_to_points=True)
+    xy = np.column_stack((vertices["SHAPE@X"], vertices["SHAPE@Y"]))
+    oids = vertices["OID@"]
+    vertex_idx = vertex_indexes(oids)
+    ring = circle_ring(segments)
+    
+    arcpy.SetProgressor("step", "Buffering Vertices", 0, len(xy), batch_size)
+    for start in range(0, len(xy), batch_size):
+        stop = start+batch_size
+        polygons = wkb_circles(xy[start:stop], radius, ring)
+        yield from zip(polygons, oids[start:stop].tolist(), vertex_idx[start:stop].tolist())
+        arcpy.SetProgressorPosition(min(stop, len(xy)))
+        arcpy.SetProgressorLabel(f"Buffering Vertices {min(stop, len(xy))}/{len(xy)}")
+    return
+
+def tree_union(geometries: list[arcpy.Geometry]) -> arcpy.Geometry:
+    """ Union geometries pairwise in rounds so every union works on similarly sized inputs """
+    while len(geometries) > 1:
+        geometries = \
+            [
+                left.union(right) if right is not None else left 
+                for left, right in zip_longest(geometries[::2], geometries[1::2])
+            ]
+    return geometries[0]
+
+def dissolve_rows(rows: Iterable[tuple[arcpy.Geometry | bytes, int, int | None]], 
+                  spatial_reference: arcpy.SpatialReference) -> Generator[tuple[arcpy.Geometry, int, None], None, None]:
+    """ Union consecutive buffer rows of the same source OID into a single (buffer, source OID, None) row
+    Only the buffers of one feature are held in memory at a time. WKB buffers are converted to geometries.
+    """
+    for oid, group in groupby(rows, key=lambda row: row[1]):
+        buffers = \
+            [
+                arcpy.FromWKB(buffer, spatial_reference) if isinstance(buffer, (bytes, bytearray)) else buffer
+                for buffer, *_ in group
+            ]
+        yield tree_union(buffers), oid, None
+    return
+
+def vertex_indexes(oids: np.ndarray) -> np.ndarray:
+    """ Position of each exploded vertex within its feature (vertices of a feature are contiguous) """
+    positions = np.arange(len(oids))
+    starts = np.r_[True, oids[1:] != oids[:-1]] if len(oids) else np.array([], dtype=bool)
+    return positions - np.maximum.accumulate(np.where(starts, positions, 0))
@@ -1,6 +1,8 @@
 import arcpy
 import subprocess
 import os
+import time
+import threading
 from pathlib import Path
 from typing import Literal
 
@@ -8,21 +10,176 @@ from utils.tool import Tool
 import utils.archelp as archelp
 from utils.archelp import print
 
+# Seconds the git status is reused before it is refreshed in the background
+STATUS_TTL = 10.0
+# Seconds the branch list is reused before the refs are read again
+BRANCHES_TTL = 30.0
+
+class GitState:
+    """ Cached state of a git repository shared by all tools that use the same workdir
+    
+    The active branch and branch list are read from the files in .git directly. The status
+    still needs git, so it is refreshed on a background thread once it is older than the TTL
+    and callers get the last known status immediately.
+    """
+    _states: dict[str, "GitState"] = {}
+    _states_lock = threading.Lock()
+    
+    def __init__(self, workdir: os.PathLike, status_ttl: float = STATUS_TTL, branches_ttl: float = BRANCHES_TTL) -> None:
+        self.workdir = Path(workdir)
+        self.git_dir = self._find_git_dir(self.workdir)
+        self.status_ttl = status_ttl
+        self.branches_ttl = branches_ttl
+        self._lock = threading.Lock()
+        self._status: str = None
+        self._status_at: float = 0.0
+        self._status_thread: threading.Thread = None
+        # Incremented by invalidate(), status reads started before that are discarded
+        self._generation: int = 0
+        self._head: tuple[float, str] = None
+        self._branches: tuple[float, list[str]] = None
+        return
+    
+    @classmethod
+    def for_workdir(cls, workdir: os.PathLike) -> "GitState":
+        """ Get the shared state of a workdir """
+        key = os.path.normcase(os.path.abspath(workdir))
+        with cls._states_lock:
+            if key not in cls._states:
+                cls._states[key] = cls(workdir)
+            return cls._states[key]
+    
+    @staticmethod
+    def _find_git_dir(workdir: Path) -> Path:
+        """ .git directory of the workdir (follows the gitdir file of worktrees and submodules) """
+        git_dir = workdir / ".git"
+        if git_dir.is_file():
+            gitdir = git_dir.read_text().strip().removeprefix("gitdir:").strip()
+            git_dir = (workdir / gitdir).resolve()
+        return git_dir
+    
+    @property
+    def active_branch(self) -> str:
+        """ Branch name from .git/HEAD (short commit hash if the HEAD is detached) """
+        head = self.git_dir / "HEAD"
+        try:
+            mtime = head.stat().st_mtime
+        except OSError:
+            return ""
+        if self._head is None or self._head[0] != mtime:
+            ref = head.read_text().strip()
+            branch = ref.removeprefix("ref:").strip().removeprefix("refs/heads/") if ref.startswith("ref:") else ref[:7]
+            self._head = (mtime, branch)
+        return self._head[1]
+    
+    @property
+    def branches(self) -> list[str]:
+        """ Local and remote branches in the format of 'git branch -a' (remotes/<remote>/<branch>) """
+        if self._branches is None or time.monotonic() - self._branches[0] > self.branches_ttl:
+            self._branches = (time.monotonic(), self._read_branches())
+        return self._branches[1]
+    
+    def _read_branches(self) -> list[str]:
+        refs: set[str] = set()
+        packed = self.git_dir / "packed-refs"
+        if packed.is_file():
+            for line in packed.read_text().splitlines():
+                if line.startswith(("#", "^")) or " " not in line:
+                    continue
+                refs.add(line.split(" ", 1)[1].strip())
+        refs_dir = self.git_dir / "refs"
+        for prefix in ("heads", "remotes"):
+            for ref in (refs_dir / prefix).rglob("*"):
+                if ref.is_file():
+                    refs.add(ref.relative_to(self.git_dir).as_posix())
+        
+        local = sorted(ref.removeprefix("refs/heads/") for ref in refs if ref.startswith("refs/heads/"))
+        remote = sorted(
+            ref.removeprefix("refs/") for ref in refs 
+            if ref.startswith("refs/remotes/") and not ref.endswith("/HEAD")
+        )
+        return local + remote
+    
+    @property
+    def status(self) -> str:
+        """ Last known 'git status' output, a refresh is started in the background when it is stale """
+        if self._status is None:
+            # Nothing to show yet, read it once so the first call has a value
+            self.refresh_status(wait=True)
+        elif time.monotonic() - self._status_at > self.status_ttl:
+            self.refresh_status()
+        return self._status
+    
+    def refresh_status(self, wait: bool = False) -> str:
+        """ Refresh the status on a background thread (or wait for it) """
+        with self._lock:
+            if self._status_thread is None or not self._status_thread.is_alive():
+                self._status_thread = threading.Thread(target=self._read_status, args=(self._generation,), daemon=True)
+                self._status_thread.start()
+            thread = self._status_thread
+        if wait:
+            thread.join()
+        return self._status
+    
+    def read_status(self) -> str:
+        """ Read the status now on the calling thread (e.g. right after a pull or checkout) """
+        return self._read_status(self._generation)
+    
+    def _read_status(self, generation: int) -> str:
+        result = git_subprocess("status", None, self.workdir)
+        status = (result.stdout or result.stderr).strip()
+        with self._lock:
+            # A read that started before the state was invalidated is superseded
+            if generation == self._generation:
+                self._status = status
+                self._status_at = time.monotonic()
+        return status
+    
+    def invalidate(self) -> None:
+        """ Drop the cached state (e.g. after a pull or checkout) """
+        with self._lock:
+            self._generation += 1
+            self._head = None
+            self._branches = None
+            self._status_at = 0.0
+        return
+
+def git_subprocess(command: Literal["branch", "pull", "checkout", "status"], 
+                   flag: Literal["-a", "--show-current"] | str | None,
+                   cwd: os.PathLike = None) -> subprocess.CompletedProcess:
+    """ Run a git command using subprocess """
+    result = subprocess.run(
+        ["git", command] + ([flag] if flag else []), 
+        cwd=cwd, 
+        capture_output=True, 
+        text=True,
+    )
+    return result
+
 class VersionControl(Tool):
-    __slots__ = ["active_branch", "branches", "workdir"]
+    __slots__ = ["git", "workdir"]
+    # The label shows the active branch, so it is never listed from the manifest
+    lazy_load = False
     
     def __init__(self) -> None:
         super().__init__()
         
         self.workdir: os.PathLike = Path(__file__).parents[2].absolute()
-        self.active_branch: str = self.get_active_branch()
-        self.branches: list[str] = self.get_branches()
+        self.git: GitState = GitState.for_workdir(self.workdir)
               
         self.label = f"Version Control ({self.active_branch})"
         self.description = "Pulls the latest changes from the remote repository or switches to a different branch."
         self.category = "Verson Control"
         return
     
+    @property
+    def active_branch(self) -> str:
+        return self.git.active_branch
+    
+    @property
+    def branches(self) -> list[str]:
+        return self.git.branches
+    
     def getParameterInfo(self) -> list:
         branch = arcpy.Parameter(
             displayName="Branch",
@@ -72,35 +229,13 @@ class VersionControl(Tool):
         params = archelp.Parameters(parameters)
         
         if params.pull.value:
-            print(self.git_subprocess("pull", None, self.workdir).stdout)
+            print(git_subprocess("pull", None, self.workdir).stdout)
         elif self.active_branch != params.branch.value:
-            print(self.git_subprocess("checkout", params.branch.value, self.workdir).stdout)
-        print(self.get_status())
+            print(git_subprocess("checkout", params.branch.value, self.workdir).stdout)
+        self.git.invalidate()
+        # A background refresh may have started before the pull, so the status is read here
+        print(self.git.read_status())
         
     def get_status(self) -> str:
-        return self.git_subprocess("status", None, self.workdir).stdout.strip()
-    
-    def get_branches(self) -> list[str]:
-        return self.parse_git_branches(self.git_subprocess("branch", "-a", self.workdir).stdout)
-    
-    def get_active_branch(self) -> str:
-        return self.git_subprocess("branch", "--show-current", self.workdir).stdout.strip()
-    
-    @staticmethod
-    def git_subprocess(command: Literal["branch", "pull", "checkout", "status"], 
-                   flag: Literal["-a", "--show-current"] | str | None,
-                   cwd: os.PathLike = None) -> subprocess.CompletedProcess:
-        """ Run a git command using subprocess """
-        result = subprocess.run(
-            ["git", command] + ([flag] if flag else []), 
-            cwd=cwd, 
-            capture_output=True, 
-            text=True,
-            shell=True,
-        )
-        return result
-    
-    @staticmethod
-    def parse_git_branches(git_branches: str) -> list:
-        """ Parse the output of 'git branch -a' """
-        return [branch.strip().replace('*', '').lstrip() for branch in git_branches.strip().split('\n')]
+        """ Last known status (refreshed in the background so the dialog does not wait on git) """
+        return self.git.status
\ No newline at end of file
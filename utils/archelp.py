@@ -6,8 +6,9 @@ import pip
 import os
 import shutil
 import json
+import time
 from pathlib import Path
-from typing import Literal, Any, Generator
+from typing import Literal, Any, Callable
 from enum import Enum
 
 class controlCLSID(Enum):
@@ -43,45 +44,204 @@ class Parameters(list):
         Assuming that paramA is the first parameter in the list of parameters
     """
       
+    __slots__ = ("_index",)
+    
     def __init__(self, parameters: list[arcpy.Parameter]) -> None:
-        self.__dict__.update({parameter.name: parameter for parameter in parameters})
+        super().__init__(parameters)
+        self._reindex()
         return
     
-    def __iter__(self) -> Generator[arcpy.Parameter, None, None]:
-        for value in self.__dict__.values():
-            yield value
+    def _reindex(self) -> None:
+        """ Rebuild the name index after the list was reordered or items were removed """
+        self._index: dict[str, int] = {parameter.name: index for index, parameter in enumerate(self)}
         return
     
-    def __len__(self) -> int:
-        return len(self.__dict__)
-    
-    def __getitem__(self, key) -> arcpy.Parameter:
-        if isinstance(key, int):
-            return list(self)[key]
-        return self.__dict__[key]
+    def __getitem__(self, key: int | str) -> arcpy.Parameter:
+        if isinstance(key, str):
+            return super().__getitem__(self._index[key])
+        return super().__getitem__(key)
     
-    def __setitem__(self, key, value) -> None:
-        if isinstance(key, int):
-            self.__dict__[list(self.__dict__)[key]] = value
-        self.__dict__[key] = value
+    def __setitem__(self, key: int | str | slice, value: arcpy.Parameter) -> None:
+        if isinstance(key, slice):
+            super().__setitem__(key, value)
+            self._reindex()
+            return
+        if isinstance(key, str):
+            if key not in self._index:
+                self.append(value)
+                return
+            key = self._index[key]
+        del self._index[super().__getitem__(key).name]
+        super().__setitem__(key, value)
+        self._index[value.name] = key % len(self)
         return
     
     def __getattr__(self, name: str) -> arcpy.Parameter:
-        if name in self.__dict__:
-            return self.__dict__[name]
-        return super().__getattribute__(name)
+        # Only called when normal attribute lookup fails, _index is always set in __init__
+        if not name.startswith("_") and name in self._index:
+            return super().__getitem__(self._index[name])
+        raise AttributeError(f"{type(self).__name__} has no parameter {name!r}")
+    
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, str):
+            return key in self._index
+        return super().__contains__(key)
     
     def append(self, parameter: arcpy.Parameter) -> None:
         if not isinstance(parameter, arcpy.Parameter):
             raise TypeError(f"Parameter must be of type arcpy.Parameter, not {type(parameter)}")
-        self.__dict__[parameter.name] = parameter
+        if parameter.name in self._index:
+            super().__setitem__(self._index[parameter.name], parameter)
+            return
+        self._index[parameter.name] = len(self)
+        super().append(parameter)
+        return
     
     def extend(self, parameters: list[arcpy.Parameter]) -> None:
         for parameter in parameters:
             self.append(parameter)
+        return
+    
+    def __iadd__(self, parameters: list[arcpy.Parameter]) -> "Parameters":
+        self.extend(parameters)
+        return self
+    
+    def __imul__(self, n: int) -> "Parameters":
+        raise TypeError("Parameter names must be unique, Parameters can't be repeated")
+    
+    def insert(self, index: int, parameter: arcpy.Parameter) -> None:
+        if not isinstance(parameter, arcpy.Parameter):
+            raise TypeError(f"Parameter must be of type arcpy.Parameter, not {type(parameter)}")
+        if parameter.name in self._index:
+            # Move the parameter instead of adding a second parameter with the same name
+            super().__delitem__(self._index[parameter.name])
+        super().insert(index, parameter)
+        self._reindex()
+        return
+    
+    def __delitem__(self, key: int | str | slice) -> None:
+        if isinstance(key, str):
+            key = self._index[key]
+        super().__delitem__(key)
+        self._reindex()
+        return
+    
+    def pop(self, key: int | str = -1) -> arcpy.Parameter:
+        if isinstance(key, str):
+            key = self._index[key]
+        parameter = super().pop(key)
+        self._reindex()
+        return parameter
+    
+    def remove(self, parameter: arcpy.Parameter) -> None:
+        super().remove(parameter)
+        self._reindex()
+        return
+    
+    def clear(self) -> None:
+        super().clear()
+        self._index.clear()
+        return
+    
+    def sort(self, *, key: Callable[[arcpy.Parameter], Any] = None, reverse: bool = False) -> None:
+        super().sort(key=key, reverse=reverse)
+        self._reindex()
+        return
+    
+    def reverse(self) -> None:
+        super().reverse()
+        self._reindex()
+        return
     
-    def __repr__(self) -> str:
-        return str(list(self.__dict__.values()))
+class ParameterCache:
+    """ Memo of parameter state and expensive results that is kept between updateParameters calls
+        Pro calls updateParameters on every edit in the tool dialog, so tools can keep one cache
+        (e.g. as a class attribute) to skip work when the parameters it depends on did not change.
+    
+        USAGE
+        >>> class MyTool(Tool):
+        >>>     parameter_cache = ParameterCache()
+        >>>     def updateParameters(self, parameters):
+        >>>         parameters = Parameters(parameters)
+        >>>         if self.parameter_cache.changed(parameters.workspace):
+        >>>             ...
+        >>>         listing = self.parameter_cache.cached(parameters.workspace.valueAsText, list_workspace)
+    """
+    __slots__ = ("maxsize", "_state", "_results")
+    
+    def __init__(self, maxsize: int = 32) -> None:
+        self.maxsize = maxsize
+        self._state: dict[str, tuple[str, bool]] = {}
+        self._results: dict[Any, Any] = {}
+        return
+    
+    def changed(self, *parameters: arcpy.Parameter) -> bool:
+        """ True if the value or altered state of any parameter changed since the last call """
+        changed = False
+        for parameter in parameters:
+            state = (parameter.valueAsText, parameter.altered)
+            if self._state.get(parameter.name) != state:
+                self._state[parameter.name] = state
+                changed = True
+        return changed
+    
+    def cached(self, key: Any, factory: Callable[[], Any]) -> Any:
+        """ Result of factory for key, only calls factory if key is not cached """
+        if key in self._results:
+            # Move the key to the end so the least recently used result is dropped first
+            self._results[key] = self._results.pop(key)
+            return self._results[key]
+        if len(self._results) >= self.maxsize:
+            del self._results[next(iter(self._results))]
+        self._results[key] = result = factory()
+        return result
+    
+    def clear(self) -> None:
+        self._state.clear()
+        self._results.clear()
+        return
+    
+class ThrottledProgressor:
+    """ Progressor label that only updates the ArcGIS Pro GUI every n rows or n seconds
+        Updating the progressor for every row of a large cursor can cost more than the row operation itself.
+    
+        USAGE
+        >>> progress = ThrottledProgressor("Appending rows", total=len(table))
+        >>> for idx, row in enumerate(rows, start=1):
+        >>>     ...
+        >>>     progress.update(idx)
+        >>> progress.finish()
+    """
+    
+    def __init__(self, label: str, total: int = None, *, every_rows: int = 10_000, every_seconds: float = 1.0) -> None:
+        self.label = label
+        self.total = total
+        self.every_rows = every_rows
+        self.every_seconds = every_seconds
+        self.position = 0
+        self._last_position = 0
+        self._last_time = time.monotonic()
+        return
+    
+    def update(self, position: int) -> None:
+        """ Set the current position, the label is only updated if the row or time threshold is passed """
+        self.position = position
+        if position - self._last_position < self.every_rows and time.monotonic() - self._last_time < self.every_seconds:
+            return
+        self._write()
+        return
+    
+    def finish(self) -> None:
+        """ Write the final position to the progressor label """
+        self._write()
+        return
+    
+    def _write(self) -> None:
+        total = f"/{self.total}" if self.total is not None else ""
+        arcpy.SetProgressorLabel(f"{self.label} ({self.position}{total})")
+        self._last_position = self.position
+        self._last_time = time.monotonic()
+        return
     
 def sanitize_filename(filename: str) -> str:
     """ Sanitize a filename """
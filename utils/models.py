@@ -1,15 +1,602 @@
 from types import UnionType
 import arcpy
 import os
+import json
+import hashlib
+import tempfile
+import time
 
 import arcpy.typing.describe as typdesc
+import numpy as np
+from pathlib import Path
+from datetime import datetime, date, time as datetime_time, timezone
+from itertools import islice
+from collections import OrderedDict
+from functools import cached_property, partial
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from array import array
+from bisect import bisect_right
 from arcpy.mp import ArcGISProject
 from arcpy.da import SearchCursor, UpdateCursor, InsertCursor, Editor
-from typing import overload, Any, Generator, Iterable, Mapping, Self
+from typing import overload, Any, Callable, Generator, Iterable, Iterator, Literal, Mapping, NamedTuple, Self, TextIO
 from archelp import print
 
 class SQLError(Exception): ...
 
+# NumPy dtypes for Field.type values (String length is taken from the field)
+FIELD_DTYPES: dict[str, str] = \
+    {
+        "SmallInteger": "<i2",
+        "Integer": "<i4",
+        "BigInteger": "<i8",
+        "OID": "<i8",
+        "Single": "<f4",
+        "Double": "<f8",
+        "Date": "<M8[us]",
+        "DateOnly": "<M8[D]",
+        "String": "<U",
+        "GUID": "<U38",
+        "GlobalID": "<U38",
+    }
+
+# NumPy dtypes for cursor tokens
+TOKEN_DTYPES: dict[str, str | tuple[str, tuple[int]]] = \
+    {
+        "OID@": "<i8",
+        "SUBTYPE@": "<i4",
+        "CREATED@": "<M8[us]",
+        "EDITED@": "<M8[us]",
+        "CREATOR@": "<U255",
+        "EDITOR@": "<U255",
+        "GLOBALID@": "<U38",
+        "SHAPE@X": "<f8",
+        "SHAPE@Y": "<f8",
+        "SHAPE@Z": "<f8",
+        "SHAPE@M": "<f8",
+        "SHAPE@AREA": "<f8",
+        "SHAPE@LENGTH": "<f8",
+        "SHAPE@XY": ("<f8", (2,)),
+        "SHAPE@TRUECENTROID": ("<f8", (2,)),
+    }
+
+# Factory code of WGS84, the default CRS of GeoParquet
+WGS84 = 4326
+
+# Arrow types for field types (pyarrow type function name and arguments)
+ARROW_TYPES: dict[str, tuple[str, ...]] = \
+    {
+        "SmallInteger": ("int16",),
+        "Integer": ("int32",),
+        "BigInteger": ("int64",),
+        "OID": ("int64",),
+        "Single": ("float32",),
+        "Double": ("float64",),
+        "Date": ("timestamp", "us"),
+        "DateOnly": ("date32",),
+        "String": ("string",),
+        "GUID": ("string",),
+        "GlobalID": ("string",),
+        "Blob": ("binary",),
+    }
+
+class UpdateResult(NamedTuple):
+    """ Number of rows updated and number of requested OIDs that were not found """
+    updated: int
+    missing: int
+
+# Maximum number of OIDs in a single IN clause
+OID_CHUNK_SIZE = 1000
+
+JSON_FORMATS = ("esri", "geojson", "ndjson")
+# Field types that are not written as JSON attributes
+NON_JSON_FIELD_TYPES = ("Geometry", "Raster", "Blob")
+ESRI_GEOMETRY_TYPES = \
+    {
+        "Point": "esriGeometryPoint",
+        "Multipoint": "esriGeometryMultipoint",
+        "Polyline": "esriGeometryPolyline",
+        "Polygon": "esriGeometryPolygon",
+        "MultiPatch": "esriGeometryMultiPatch",
+    }
+
+class RowCache(OrderedDict):
+    """ Least recently used cache of rows by OID (a maxsize of 0 disables the cache) """
+    
+    def __init__(self, maxsize: int = 0):
+        super().__init__()
+        self.maxsize = maxsize
+        return
+    
+    def get(self, oid: int, default: Any = None) -> Any:
+        if oid not in self:
+            return default
+        self.move_to_end(oid)
+        return self[oid]
+    
+    def put(self, oid: int, row: Any) -> None:
+        if not self.maxsize:
+            return
+        self[oid] = row
+        self.move_to_end(oid)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+        return
+
+class OIDIndex:
+    """ Compact sorted index of object IDs
+    
+    OIDs are stored as runs of consecutive values in two int64 arrays
+    (run starts and exclusive run stops). Dense OID ranges collapse into a
+    single run and sparse OIDs cost 16 bytes each instead of a boxed int
+    in a set. Membership and range lookups are done with bisect.
+    
+    usage:
+    >>> index = OIDIndex([1, 2, 3, 7, 8])
+    >>> 2 in index
+    True
+    >>> list(index.ranges())
+    [(1, 4), (7, 9)]
+    >>> list(index.between(3, 7))
+    [3, 7]
+    """
+    
+    __slots__ = ("_starts", "_stops", "_count")
+    
+    def __init__(self, oids: Iterable[int] = ()):
+        self._starts: array = array('q')
+        self._stops: array = array('q')
+        self._count: int = 0
+        self.update(oids)
+        return
+    
+    def add(self, oid: int) -> None:
+        """ Add an OID to the index (appending in ascending order is O(1)) """
+        starts, stops = self._starts, self._stops
+        # Fast path for cursors that return OIDs in ascending order
+        if not stops or oid > stops[-1]:
+            starts.append(oid)
+            stops.append(oid + 1)
+        elif oid == stops[-1]:
+            stops[-1] += 1
+        else:
+            idx = bisect_right(starts, oid) - 1
+            if idx >= 0 and oid < stops[idx]:
+                return
+            joins_left = idx >= 0 and stops[idx] == oid
+            joins_right = idx + 1 < len(starts) and starts[idx + 1] == oid + 1
+            if joins_left and joins_right:
+                stops[idx] = stops[idx + 1]
+                del starts[idx + 1]
+                del stops[idx + 1]
+            elif joins_left:
+                stops[idx] = oid + 1
+            elif joins_right:
+                starts[idx + 1] = oid
+            else:
+                starts.insert(idx + 1, oid)
+                stops.insert(idx + 1, oid + 1)
+        self._count += 1
+        return
+    
+    def update(self, oids: Iterable[int]) -> None:
+        """ Add OIDs to the index one at a time 
+        Sets are sorted first, adding in arbitrary order inserts into the middle of the runs
+        """
+        if isinstance(oids, (set, frozenset)):
+            oids = sorted(oids)
+        for oid in oids:
+            self.add(oid)
+        return
+    
+    def discard(self, oid: int) -> None:
+        """ Remove an OID from the index if it is present """
+        starts, stops = self._starts, self._stops
+        idx = bisect_right(starts, oid) - 1
+        if idx < 0 or oid >= stops[idx]:
+            return
+        start, stop = starts[idx], stops[idx]
+        if start == oid and stop == oid + 1:
+            del starts[idx]
+            del stops[idx]
+        elif start == oid:
+            starts[idx] = oid + 1
+        elif stop == oid + 1:
+            stops[idx] = oid
+        else:
+            # Split the run around the removed OID
+            stops[idx] = oid
+            starts.insert(idx + 1, oid + 1)
+            stops.insert(idx + 1, stop)
+        self._count -= 1
+        return
+    
+    def ranges(self) -> Generator[tuple[int, int], None, None]:
+        """ Yield (start, stop) pairs of consecutive OIDs (stop is exclusive) """
+        yield from zip(self._starts, self._stops)
+    
+    def between(self, low: int, high: int) -> Generator[int, None, None]:
+        """ Yield all OIDs in the index where low <= OID <= high """
+        idx = max(bisect_right(self._starts, low) - 1, 0)
+        for start, stop in zip(self._starts[idx:], self._stops[idx:]):
+            if start > high:
+                return
+            yield from range(max(start, low), min(stop, high + 1))
+    
+    def predicate(self, field: str) -> str:
+        """ SQL predicate that matches the OIDs in the index
+        Runs of three or more OIDs become BETWEEN ranges and the rest are grouped in an IN list
+        
+        >>> OIDIndex([1, 2, 3, 4, 7, 9]).predicate("OBJECTID")
+        '(OBJECTID BETWEEN 1 AND 4 OR OBJECTID IN (7,9))'
+        """
+        return next(self.predicates(field))
+    
+    def predicates(self, field: str, max_terms: int = None) -> Generator[str, None, None]:
+        """ Split the index into predicates of at most max_terms terms (one per cursor pass)
+        A BETWEEN range counts as one term and each OID of an IN list counts as one term. 
+        Predicates are yielded in ascending OID order, an empty index yields a single predicate
+        that matches nothing.
+        """
+        ranges: list[str] = []
+        singles: list[int] = []
+        empty = True
+        for start, stop in self.ranges():
+            if stop - start > 2:
+                ranges.append(f"{field} BETWEEN {start} AND {stop - 1}")
+            else:
+                singles.extend(range(start, stop))
+            while max_terms and len(ranges) + len(singles) >= max_terms:
+                split = max_terms - len(ranges)
+                yield _join_predicates(field, ranges, singles[:split])
+                ranges, singles = [], singles[split:]
+                empty = False
+        if ranges or singles:
+            yield _join_predicates(field, ranges, singles)
+        elif empty:
+            yield "1 = 0"
+        return
+    
+    def __and__(self, other: Iterable[int]) -> Self:
+        """ Intersection of two indexes """
+        small, large = (self, other) if len(self) <= len(other) else (other, self)
+        if isinstance(small, OIDIndex):
+            return type(self)(oid for oid in small if oid in large)
+        return type(self)(sorted(oid for oid in small if oid in large))
+    
+    def __contains__(self, oid: object) -> bool:
+        if not isinstance(oid, int):
+            return False
+        idx = bisect_right(self._starts, oid) - 1
+        return idx >= 0 and oid < self._stops[idx]
+    
+    def __iter__(self) -> Generator[int, None, None]:
+        for start, stop in self.ranges():
+            yield from range(start, stop)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __bool__(self) -> bool:
+        return self._count > 0
+    
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {self._count} OIDs in {len(self._starts)} runs @ {hex(id(self))}>"
+
+def _join_predicates(field: str, ranges: list[str], singles: list[int]) -> str:
+    """ OR together BETWEEN ranges and an IN list of single OIDs """
+    terms = [*ranges, f"{field} IN ({','.join(map(str, singles))})"] if singles else ranges
+    if len(terms) == 1:
+        return terms[0]
+    return f"({' OR '.join(terms)})"
+
+def oid_predicates(field: str, oids: Iterable[int], max_terms: int = OID_CHUNK_SIZE) -> Generator[str, None, None]:
+    """ Compress a set of OIDs into BETWEEN/IN predicates of at most max_terms terms each
+    Large or scattered sets yield multiple predicates that should be run as separate cursor passes
+    
+    >>> list(oid_predicates("OBJECTID", [*range(1, 10_001), 10_005, 10_007]))
+    ['(OBJECTID BETWEEN 1 AND 10000 OR OBJECTID IN (10005,10007))']
+    """
+    # Selection sets are unordered, the index is only built in linear time from sorted OIDs
+    oids = oids if isinstance(oids, OIDIndex) else OIDIndex(sorted(oids))
+    yield from oids.predicates(field, max_terms)
+    return
+
+def layer_clauses(layer: arcpy.mp.Layer, *, 
+                  oid_field: str = None, 
+                  max_terms: int = OID_CHUNK_SIZE) -> Generator[str | None, None, None]:
+    """ Where clauses that match the selected features of a layer within its definition query
+    
+    The selection is compressed with oid_predicates so a large selection is read in multiple 
+    cursor passes instead of a single huge IN list. Yields the definition query (or None) once 
+    if the layer has no selection.
+    
+    usage:
+    >>> features = FeatureClass(arcpy.Describe(layer).catalogPath)
+    >>> for where_clause in layer_clauses(layer, oid_field=features.OIDField):
+    ...     with features.search_cursor(["OID@", "SHAPE@"], where_clause=where_clause) as cursor: ...
+    """
+    definition_query = layer.definitionQuery or None
+    selection = layer.getSelectionSet()
+    if not selection:
+        yield definition_query
+        return
+    oid_field = oid_field or arcpy.Describe(layer).OIDFieldName
+    for predicate in oid_predicates(oid_field, selection, max_terms):
+        yield f"({definition_query}) AND ({predicate})" if definition_query else predicate
+    return
+
+class Query:
+    """ Composable query of a where clause, an OID set and a spatial filter
+    
+    Queries are immutable and combined with &. The compiled SQL is cached on the
+    query and OID sets are compiled to BETWEEN ranges where the OIDs are contiguous.
+    
+    usage:
+    >>> query = Query("STATUS = 'ACTIVE'") & Query(oids=range(1, 1001))
+    >>> query.sql("OBJECTID")
+    "(STATUS = 'ACTIVE') AND (OBJECTID BETWEEN 1 AND 1000)"
+    """
+    
+    __slots__ = ("where", "oids", "spatial_filter", "_sql", "_clauses", "_key")
+    
+    def __init__(self, where: str = None, *, oids: Iterable[int] | OIDIndex = None, spatial_filter: arcpy.Geometry = None):
+        self.where: str | None = where or None
+        self.oids: OIDIndex | None = oids if oids is None or isinstance(oids, OIDIndex) else OIDIndex(oids)
+        self.spatial_filter: arcpy.Geometry | None = spatial_filter
+        self._sql: dict[str, str | None] = {}
+        self._clauses: dict[tuple[str, int], list[str | None]] = {}
+        self._key: tuple = None
+        return
+    
+    def __and__(self, other: Self) -> Self:
+        """ Combine two queries (where clauses are ANDed and OID sets are intersected)
+        Spatial filters of the same geometry type are unioned, otherwise the right filter is used
+        """
+        if not other:
+            return self
+        if not self:
+            return other
+        if self.where and other.where:
+            where = f"({self.where}) AND ({other.where})"
+        else:
+            where = self.where or other.where
+        if self.oids is not None and other.oids is not None:
+            oids = self.oids & other.oids
+        else:
+            oids = self.oids if other.oids is None else other.oids
+        spatial_filter = other.spatial_filter or self.spatial_filter
+        if self.spatial_filter and other.spatial_filter and self.spatial_filter.type == other.spatial_filter.type:
+            spatial_filter = self.spatial_filter.union(other.spatial_filter)
+        return Query(where, oids=oids, spatial_filter=spatial_filter)
+    
+    def __bool__(self) -> bool:
+        return bool(self.where) or self.oids is not None or self.spatial_filter is not None
+    
+    def sql(self, oid_field: str) -> str | None:
+        """ Compiled where clause (None if the query has no where clause or OID set) """
+        if oid_field not in self._sql:
+            parts = [self.where] if self.where else []
+            if self.oids is not None:
+                parts.append(self.oids.predicate(oid_field))
+            if len(parts) > 1:
+                self._sql[oid_field] = " AND ".join(f"({part})" for part in parts)
+            else:
+                self._sql[oid_field] = parts[0] if parts else None
+        return self._sql[oid_field]
+    
+    def clauses(self, oid_field: str, max_terms: int = OID_CHUNK_SIZE) -> list[str | None]:
+        """ Compiled where clauses with the OID set split into predicates of at most max_terms terms
+        Each clause is one cursor pass, a query without an OID set has a single clause
+        """
+        key = (oid_field, max_terms)
+        if key not in self._clauses:
+            if self.oids is None:
+                self._clauses[key] = [self.where]
+            else:
+                self._clauses[key] = \
+                    [
+                        f"({self.where}) AND ({predicate})" if self.where else predicate
+                        for predicate in self.oids.predicates(oid_field, max_terms)
+                    ]
+        return self._clauses[key]
+    
+    @property
+    def key(self) -> tuple:
+        """ Hashable key of the query """
+        if self._key is None:
+            self._key = \
+                (
+                    self.where, 
+                    tuple(self.oids.ranges()) if self.oids is not None else None, 
+                    self.spatial_filter.JSON if self.spatial_filter is not None else None,
+                )
+        return self._key
+    
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {self.sql('OID')} @ {hex(id(self))}>"
+
+class QueryManager:
+    """ Caches the OIDs (and so the count) that match each query of a table
+    
+    Re-applying a query that was already run does not open a cursor. Deletes through the
+    table cursors are removed from every cached result, inserts are added to the unqueried
+    result and drop the others (the new row may or may not match them). Updates drop every
+    result except the unqueried one, the updated row may no longer match them.
+    """
+    
+    def __init__(self, table: "Table", max_queries: int = 16):
+        self.table = table
+        self.max_queries = max_queries
+        self._results: OrderedDict[tuple, OIDIndex] = OrderedDict()
+        return
+    
+    def oids(self, query: Query) -> OIDIndex:
+        """ Index of the OIDs that match the query """
+        key = query.key
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+        oids = OIDIndex()
+        for sql in query.clauses(self.table.OIDField):
+            with SearchCursor(self.table.path, ["OID@"], where_clause=sql, spatial_filter=query.spatial_filter) as cursor:
+                oids.update(oid for oid, in cursor)
+        self._results[key] = oids
+        if len(self._results) > self.max_queries:
+            self._results.popitem(last=False)
+        return oids
+    
+    def count(self, query: Query) -> int:
+        """ Number of rows that match the query """
+        return len(self.oids(query))
+    
+    def track_insert(self, oid: int) -> None:
+        unqueried = Query().key
+        for key in list(self._results):
+            if key == unqueried:
+                self._results[key].add(oid)
+            else:
+                del self._results[key]
+        return
+    
+    def track_update(self) -> None:
+        unqueried = Query().key
+        for key in list(self._results):
+            if key != unqueried:
+                del self._results[key]
+        return
+    
+    def track_delete(self, oid: int | None) -> None:
+        if oid is None:
+            self.invalidate()
+            return
+        for oids in self._results.values():
+            oids.discard(oid)
+        return
+    
+    def invalidate(self) -> None:
+        """ Drop all cached query results """
+        self._results.clear()
+        return
+
+class EditSession:
+    """ Edit session shared by every table in the same workspace
+    
+    Sessions are reentrant, nested use (e.g. a table write inside a bulk pipeline) keeps the
+    outer session open instead of starting and stopping a new edit session per write. Edits are
+    saved when the outermost use exits, or every commit_every operations counted with tick().
+    
+    usage:
+    >>> with EditSession.for_path(gdb, commit_every=10_000) as session:
+    ...     for oid, row in rows:
+    ...         table[oid] = row  # Uses the open session
+    ...         session.tick()
+    >>> session = table.editor.begin()  # Long lived session for a pipeline
+    >>> ...
+    >>> session.end()
+    """
+    
+    # Shared sessions by editor workspace
+    _sessions: dict[str, "EditSession"] = {}
+    # Resolved editor workspace by the workspace it was resolved from
+    _workspaces: dict[str, str] = {}
+    
+    def __init__(self, workspace: os.PathLike, commit_every: int = None):
+        self.workspace = workspace
+        self.editor = Editor(workspace)
+        self.commit_every = commit_every
+        self.depth = 0
+        self.operations = 0
+        return
+    
+    @classmethod
+    def for_path(cls, path: os.PathLike, *, commit_every: int = None) -> Self:
+        """ Get the shared session of the workspace that contains path 
+        commit_every replaces the batch size of the shared session if it is set
+        """
+        workspace = cls.resolve_workspace(path)
+        key = os.path.normcase(os.path.abspath(workspace))
+        if key not in cls._sessions:
+            cls._sessions[key] = cls(workspace)
+        session = cls._sessions[key]
+        if commit_every is not None:
+            session.commit_every = commit_every
+        return session
+    
+    @classmethod
+    def resolve_workspace(cls, path: os.PathLike) -> str:
+        """ First directory up from path that can be edited (cached per path) """
+        key = os.path.normcase(os.path.abspath(path))
+        if key not in cls._workspaces:
+            workspace = path
+            while True:
+                try:
+                    with Editor(workspace):
+                        break
+                except RuntimeError:
+                    parent = os.path.dirname(workspace)
+                    if parent == workspace:
+                        raise
+                    workspace = parent
+            cls._workspaces[key] = workspace
+        return cls._workspaces[key]
+    
+    @property
+    def active(self) -> bool:
+        return self.depth > 0
+    
+    def begin(self) -> Self:
+        """ Enter the session, the edit session is only started by the outermost begin """
+        if self.depth == 0:
+            self.editor.startEditing()
+            self.editor.startOperation()
+            self.operations = 0
+        self.depth += 1
+        return self
+    
+    def end(self, save: bool = True) -> None:
+        """ Exit the session, the edits are saved (or discarded) when the outermost begin ends """
+        if self.depth == 0:
+            return
+        self.depth -= 1
+        if self.depth > 0:
+            return
+        if save:
+            self.editor.stopOperation()
+        else:
+            self.editor.abortOperation()
+        self.editor.stopEditing(save)
+        self.operations = 0
+        return
+    
+    def tick(self, operations: int = 1) -> None:
+        """ Count operations and save the edits every commit_every operations """
+        self.operations += operations
+        if self.commit_every and self.operations >= self.commit_every:
+            self.commit()
+        return
+    
+    def commit(self) -> None:
+        """ Save the edits of the open session and keep it open """
+        if not self.active:
+            return
+        self.editor.stopOperation()
+        self.editor.stopEditing(True)
+        self.editor.startEditing()
+        self.editor.startOperation()
+        self.operations = 0
+        return
+    
+    def __enter__(self) -> Self:
+        return self.begin()
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.end(save=exc_type is None)
+        return
+    
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {self.workspace} (depth {self.depth}) @ {hex(id(self))}>"
+
 class DescribeModel:
     """ Base object for models """
         
@@ -49,17 +636,29 @@ class DescribeModel:
         return f"{type(self).__name__}: {self.basename} - {self.path}"
 
 class Table(DescribeModel):
-    """ Wrapper for basic Table operations """
+    """ Wrapper for basic Table operations
+    
+    When lazy is set, the field map, record count, OID set and editor are
+    not loaded until they are first used and are cached after that
+    
+    Rows are yielded as dictionaries by default, set row_factory to as_rows
+    to get read only Row tuples that allow access by fieldname without
+    building a dictionary for every row
+    
+    Set cache_size to keep the last n rows retrieved by OID in memory
+    """
     
     ALL_FIELDS = object()
     
-    def __init__(self, path: os.PathLike):
+    def __init__(self, path: os.PathLike, *, lazy: bool = False, cache_size: int = 0):
         super().__init__(path)
         self._describe: typdesc.Table = self._describe
         self._query: str = None
         self._spatial_filter: arcpy.Geometry = None
-        self.fields: dict[str, arcpy.Field] = {field.name: field for field in arcpy.ListFields(self.path)}
-        self.fieldnames: list[str] = list(self.fields.keys())
+        self._oid_filter: OIDIndex = None
+        self._current_query: Query = None
+        self.queries: QueryManager = QueryManager(self)
+        self.lazy: bool = lazy
         self.OIDField: str = self._describe.OIDFieldName
         self.cursor_tokens: list[str] = \
             [
@@ -72,16 +671,107 @@ class Table(DescribeModel):
                 "SUBTYPE@",
                 "*"
             ]
-        self.valid_fields = self.fieldnames + self.cursor_tokens
-        self.queried: bool = False
-        self._queried_count: int = 0
+        # Set when rows were written without the table cursors (e.g. Append)
         self._updated: bool = False
-        self.record_count: int = int(arcpy.management.GetCount(self.path).getOutput(0))
-        self._oid_set: set[int] = set(self[self.OIDField])
-        self.editor: Editor = self._get_editor() # sets a valid workspace
         self._iter = None
+        self.row_factory: Callable[[SearchCursor], Iterator[Mapping[str, Any]]] = as_dict
+        self._row_cache: RowCache = RowCache(cache_size)
+        if not lazy:
+            self._load()
+        return
+    
+    def _load(self) -> None:
+        """ Load all lazy attributes (field map, record count, OID set and editor) """
+        for attr in ("fields", "fieldnames", "valid_fields", "record_count", "_oid_set", "editor"):
+            getattr(self, attr)
+        return
+    
+    @cached_property
+    def fields(self) -> dict[str, arcpy.Field]:
+        """ Field objects of the table by name """
+        return {field.name: field for field in arcpy.ListFields(self.path)}
+    
+    @cached_property
+    def fieldnames(self) -> list[str]:
+        """ Names of the fields in the table """
+        return list(self.fields.keys())
+    
+    @cached_property
+    def valid_fields(self) -> list[str]:
+        """ Fieldnames and cursor tokens that can be passed to a cursor """
+        return self.fieldnames + self.cursor_tokens
+    
+    @cached_property
+    def record_count(self) -> int:
+        """ Number of records in the table (ignores query and spatial filter) """
+        return int(arcpy.management.GetCount(self.path).getOutput(0))
+    
+    @property
+    def _oid_set(self) -> OIDIndex:
+        """ Index of all OIDs that match the current query (cached per query by the QueryManager) """
+        return self.queries.oids(self.current_query)
+    
+    @cached_property
+    def editor(self) -> EditSession:
+        """ Shared edit session of the table workspace (sets a valid workspace) """
+        session = EditSession.for_path(self.workspace)
+        self.workspace = session.workspace
+        return session
+    
+    @cached_property
+    def fingerprint(self) -> str:
+        """ Hash of the field names, types and lengths and the geometry type of the table """
+        fields = sorted((field.name.upper(), field.type, field.length) for field in self.fields.values())
+        return schema_fingerprint(getattr(self, "shapeType", None), fields)
+    
+    def _query_changed(self) -> None:
+        """ Drop the compiled table query and any cached rows that may not match the new query """
+        self._current_query = None
+        self._row_cache.clear()
+        return
+    
+    def _track_insert(self, oid: int) -> None:
+        """ Update the record count and query results after a row is inserted by a table cursor """
+        if "record_count" in self.__dict__:
+            self.record_count += 1
+        self.queries.track_insert(oid)
+        return
+    
+    def _track_update(self) -> None:
+        """ Drop the query results that an update by a table cursor may have changed """
+        self.queries.track_update()
+        return
+    
+    def _track_delete(self, oid: int | None) -> None:
+        """ Update the record count and query results after a row is deleted by a table cursor 
+        oid is None if the cursor did not read the OID field
+        """
+        if "record_count" in self.__dict__:
+            self.record_count -= 1
+        self._row_cache.pop(oid, None)
+        self.queries.track_delete(oid)
+        return
+    
+    def refresh(self) -> None:
+        """ Drop the record count, query results and row cache so they are read again on next use """
+        self.__dict__.pop("record_count", None)
+        self.queries.invalidate()
+        self._row_cache.clear()
+        self._updated = False
         return
     
+    @property
+    def queried(self) -> bool:
+        """ True if a query, spatial filter or OID filter is set """
+        return bool(self._query) or self._spatial_filter is not None or self._oid_filter is not None
+    
+    @property
+    def current_query(self) -> Query:
+        """ Combined query, spatial filter and OID filter of the table """
+        if self._current_query is None:
+            self._current_query = Query(self._query, oids=self._oid_filter, spatial_filter=self._spatial_filter)
+        return self._current_query
+    
     @property
     def query(self) -> str:
         """ Get the query string """
@@ -90,52 +780,70 @@ class Table(DescribeModel):
     @query.setter
     def query(self, query_string: str):
         """ Set the query string """
-        if not query_string: del self.query
+        if not query_string: 
+            del self.query
+            return
         try:
             with self.search_cursor(where_clause=query_string) as cur: cur.fields
         except Exception as e: print(f"Invalid query string ({query_string})\n{e}", "warning")
         self._query = query_string
-        self._updated = True
-        self.queried = True
-        self._queried_count = len(self)
-        self._oid_set = set(self[self.OIDField])
+        self._query_changed()
         return
     
     @query.deleter
     def query(self):
         """ Delete the query string """
         self._query = None
-        self.queried = False
-        self._oid_set = set(self[self.OIDField])
+        self._query_changed()
         return
 
     @property
     def spatial_filter(self) -> arcpy.Geometry:
-        """ Get the query string """
+        """ Get the spatial filter """
         return self._spatial_filter
     
     @spatial_filter.setter
     def spatial_filter(self, filter_shape: arcpy.Geometry):
-        """ Set the query string """
-        if not filter_shape: del self._spatial_filter
+        """ Set the spatial filter """
+        if not filter_shape: 
+            del self.spatial_filter
+            return
         try:
             with self.search_cursor(spatial_filter=filter_shape) as cur:
                 cur.fields
         except Exception as e:
             print(f"Invalid spatial filter ({filter_shape})\n{e}", "warning")
         self._spatial_filter = filter_shape
-        self._updated = True
-        self.queried = True
-        self._queried_count = len(self)
-        self._oid_set = set(self[self.OIDField])
+        self._query_changed()
         return
     
     @spatial_filter.deleter
     def spatial_filter(self):
-        """ Delete the query string """
+        """ Delete the spatial filter """
         self._spatial_filter = None
-        self.queried = False
-        self._oid_set = set(self[self.OIDField])
+        self._query_changed()
+        return
+    
+    @property
+    def oid_filter(self) -> OIDIndex:
+        """ Get the OID filter """
+        return self._oid_filter
+    
+    @oid_filter.setter
+    def oid_filter(self, oids: Iterable[int]):
+        """ Limit the table to a set of OIDs (compiled to BETWEEN/IN predicates) """
+        if oids is None:
+            del self.oid_filter
+            return
+        self._oid_filter = oids if isinstance(oids, OIDIndex) else OIDIndex(oids)
+        self._query_changed()
+        return
+    
+    @oid_filter.deleter
+    def oid_filter(self):
+        """ Delete the OID filter """
+        self._oid_filter = None
+        self._query_changed()
         return
     
     @property
@@ -152,40 +860,12 @@ class Table(DescribeModel):
     def describe(self):
         raise AttributeError("Describe object is read-only")
     
-    # This query handling is kinda messy
-    # TODO: Create a QueryManager class that handles query operations
-    
-    def _handle_queries(self, kwargs):
-        if 'where_clause' in kwargs and self.query:
-            return f"({self.query}) AND ({kwargs['where_clause']})"
-        elif 'where_clause' in kwargs:
-            return kwargs['where_clause']
-        return self.query
-    
-    def _handle_spatial_filter(self, kwargs):
-        if self.spatial_filter and 'spatial_filter' in kwargs and self.spatial_filter.type == kwargs['spatial_filter'].type:
-            return self.spatial_filter.union(kwargs['spatial_filter'])
-        elif 'spatial_filter' in kwargs:
-            return kwargs['spatial_filter']
-        return self.spatial_filter
-        
     def _validate_fields(self, fields: list[str]) -> bool:
         """ Validate field list for cursors """
         if fields not in (["*"] , Table.ALL_FIELDS) and not all(field in self.valid_fields for field in fields):
             return False
         return True
     
-    def _get_editor(self) -> Editor:
-        """ Get the editor of the table (walks up the directory tree until it finds a valid workspace)"""
-        valid_workspace = False
-        while not valid_workspace:
-            try:
-                with Editor(self.workspace):
-                    valid_workspace = True
-            except RuntimeError:
-                self.workspace = os.path.dirname(self.workspace)
-        return Editor(self.workspace)
-    
     def _cursor(self, cur_type: str, fields: list[str]=ALL_FIELDS, **kwargs) -> UpdateCursor | SearchCursor | InsertCursor:
         """ Internal cursor method to get cursor type
         """
@@ -195,72 +875,113 @@ class Table(DescribeModel):
         if not self._validate_fields(fields): 
             raise ValueError(f"Fields must be in {self.valid_fields}")
         
-        kwargs['where_clause'] = self._handle_queries(kwargs)
-        kwargs['spatial_filter'] = self._handle_spatial_filter(kwargs)
-        
-        if cur_type == "search": 
-            return SearchCursor(self.path, fields, **kwargs)
+        # The compiled clauses are cached on the current query, an extra where clause is
+        # ANDed to them as a string so the OID filter is not compiled again for every cursor
+        query = self.current_query
+        where_clause = kwargs.get('where_clause')
+        clauses = query.clauses(self.OIDField)
+        if where_clause:
+            clauses = [f"({clause}) AND ({where_clause})" if clause else where_clause for clause in clauses]
+        if kwargs.get('spatial_filter') is not None:
+            query = query & Query(spatial_filter=kwargs['spatial_filter'])
+        kwargs['spatial_filter'] = query.spatial_filter
         
-        if cur_type == "update":
-            self._updated = True
-            return UpdateCursor(self.path, fields, **kwargs)
+        if cur_type in ("search", "update"):
+            cursor_type = SearchCursor if cur_type == "search" else UpdateCursor
+            cursors = [partial(cursor_type, self.path, fields, **{**kwargs, 'where_clause': clause}) for clause in clauses]
+            # Large OID filters are read in one cursor pass per clause
+            cursor = cursors[0]() if len(cursors) == 1 else ChainedCursor(cursors)
+            return cursor if cur_type == "search" else TrackedCursor(self, cursor)
         
         if cur_type == "insert":
             # InsertCursor only supports datum_transformation and explicit kwargs
             kwargs = {k:v for k, v in kwargs.items() if k in ['datum_transformation', 'explicit']}
-            self._updated = True
-            return InsertCursor(self.path, fields, **kwargs)
+            return TrackedCursor(self, InsertCursor(self.path, fields, **kwargs))
         
         raise ValueError(f"Invalid cursor type {cur_type}")
     
     def __iter__(self) -> Generator[dict[str, Any], None, None]:
-        yield from as_dict(self.search_cursor())
+        yield from self.row_factory(self.search_cursor())
     
     def __len__(self) -> int:
-        if self.queried: 
-            return self._queried_count
+        # Rows were written outside of the table cursors, so the tracked counts are unknown
+        if self._updated:
+            self.refresh()
         
-        if not self._updated:
-            return self.record_count
+        if self.queried:
+            return self.queries.count(self.current_query)
         
-        self._updated = False
-        self.record_count = int(arcpy.management.GetCount(self.path).getOutput(0))
         return self.record_count
     
     def __getitem__(self, idx: int | str | Iterable[int] | Iterable[str]) -> Any:
-        # When retreiving a single object by OID, a generator is returned and next must be called
+        # When retreiving a single object by OID, the row is returned directly
         # e.g. 
-        # >>> table[1] -> <generator object Table...>
-        # >>> next(table[1]) -> {field: value}
-        # This allows a reference to the object to be stored before using it
+        # >>> table[1] -> {field: value}
+        # Fields and lists of fields or OIDs return a generator
+        # >>> table["FIELD"] -> <generator object Table...>
+        # This allows a reference to the rows to be stored before using them
         if isinstance(idx, int):
-            if not idx in self._oid_set:
-                raise KeyError(f"{idx} not a valid OID")
-            #yield from as_dict(self.search_cursor(where_clause=f"{self.OIDField} = {idx}"))
-            return next(as_dict(self.search_cursor(where_clause=f"{self.OIDField} = {idx}")))
-
+            return self._get_row(idx)
+        
         if isinstance(idx, str):
             if idx not in self.fieldnames:
                 raise KeyError(f"{idx} not in {self.valid_fields}")
-            yield from (value[idx] for value in as_dict(self.search_cursor([idx])))
-            return
+            return (value for value, in self.search_cursor([idx]))
         
-        if isinstance(idx, Iterable) and all(field in self.valid_fields for field in idx):
-            yield from as_dict(self.search_cursor(idx))
-            return
-            
-        if isinstance(idx, Iterable) and all(isinstance(oid, int) for oid in idx):
-            yield from as_dict(self.search_cursor(where_clause=f"{self.OIDField} IN ({','.join(str(i) for i in idx)})"))
-            return
+        if isinstance(idx, Iterable):
+            idx = list(idx)
+            if all(field in self.valid_fields for field in idx):
+                return self.row_factory(self.search_cursor(idx))
+            if all(isinstance(oid, int) for oid in idx):
+                return self._get_rows(idx)
         
         raise ValueError(f"{idx} is invalid, either pass field, OID, or list of fields or list of OIDs ({self.valid_fields})")
-     
+    
+    def _get_row(self, oid: int) -> Mapping[str, Any]:
+        """ Get a single row by OID, checking the row cache first """
+        row = self._row_cache.get(oid)
+        if row is None:
+            if not oid in self._oid_set:
+                raise KeyError(f"{oid} not a valid OID")
+            row = next(self.row_factory(self.search_cursor(where_clause=f"{self.OIDField} = {oid}")), None)
+            if row is None:
+                raise KeyError(f"{oid} not a valid OID")
+            self._row_cache.put(oid, row)
+        return row.copy() if isinstance(row, dict) else row
+    
+    def _get_rows(self, oids: Iterable[int]) -> Generator[Mapping[str, Any], None, None]:
+        """ Get rows for a list of OIDs in ascending OID order
+        OIDs are fetched in bounded BETWEEN/IN clauses and cached rows are not fetched again
+        """
+        if not self._row_cache.maxsize:
+            for where_clause in oid_predicates(self.OIDField, oids):
+                yield from self.row_factory(self.search_cursor(where_clause=where_clause))
+            return
+        
+        oids = sorted(set(oids))
+        missing = [oid for oid in oids if oid not in self._row_cache]
+        fetched: dict[int, Mapping[str, Any]] = {}
+        for where_clause in oid_predicates(self.OIDField, missing) if missing else ():
+            for row in self.row_factory(self.search_cursor(where_clause=where_clause)):
+                fetched[row[self.OIDField]] = row
+        for oid in oids:
+            row = fetched.pop(oid, None)
+            if row is not None:
+                self._row_cache.put(oid, row)
+            else:
+                row = self._row_cache.get(oid)
+            if row is not None:
+                yield row.copy() if isinstance(row, dict) else row
+        return
+    
     def __setitem__(self, idx: int | str | Iterable[str], val: Mapping[str, Any] | Any) -> None:
         
         if (idx in self._oid_set) and isinstance(val, Mapping) and all(field in val.keys() for field in self.fieldnames):
             with self.editor:
-                with self.update_cursor(list(val.keys()), where_clause=f"{self.OIDField} = {idx}") as cursor:
+                with self._cursor("update", list(val.keys()), where_clause=f"{self.OIDField} = {idx}") as cursor:
                     for _ in cursor: cursor.updateRow([val[field] for field in cursor.fields])
+                self.editor.tick()
+            self._row_cache.pop(idx, None)
             return
         
         if isinstance(idx, str) and idx in self.valid_fields:
@@ -277,11 +998,57 @@ class Table(DescribeModel):
         
         raise ValueError(f"{idx} not in {self.valid_fields} or index is out of range")
     
+    def update_rows(self, updates: Mapping[int, Mapping[str, Any]] | Iterable[Mapping[str, Any]], *, 
+                    commit_every: int = None) -> UpdateResult:
+        """ Update many rows in a single edit session
+        updates: {OID: {field: value}} or rows (mappings) that contain the OID field
+        commit_every: save the edits every n OIDs (default is a single commit at the end)
+        return: UpdateResult(updated, missing)
+        
+        The requested OIDs are sorted and each batch of commit_every OIDs is updated with update 
+        cursors over its OID predicates (see oid_predicates). Fields that are not in an update keep 
+        their value. Rows can be dicts or Rows from as_rows (with the OID field or the OID@ token).
+        
+        usage:
+        >>> table.update_rows({1: {"STATUS": "DONE"}, 5: {"STATUS": "DONE", "COUNT": 2}})
+        UpdateResult(updated=2, missing=0)
+        """
+        if not isinstance(updates, Mapping):
+            updates = {row[self.OIDField] if self.OIDField in row else row["OID@"]: row for row in updates}
+        fields = \
+            [
+                field 
+                for field in dict.fromkeys(key for values in updates.values() for key in values.keys()) 
+                if field not in (self.OIDField, "OID@")
+            ]
+        if not self._validate_fields(fields):
+            raise ValueError(f"Fields must be in {self.valid_fields}")
+        
+        oids = sorted(updates)
+        batch_size = commit_every or len(oids) or 1
+        updated = 0
+        with self.editor:
+            for start in range(0, len(oids), batch_size):
+                batch = oids[start:start+batch_size]
+                for where_clause in oid_predicates(self.OIDField, batch):
+                    with self._cursor("update", ["OID@", *fields], where_clause=where_clause) as cursor:
+                        for oid, *values in cursor:
+                            new_values = updates.get(oid)
+                            if new_values is None:
+                                continue
+                            cursor.updateRow([oid, *(new_values.get(field, value) for field, value in zip(fields, values))])
+                            self._row_cache.pop(oid, None)
+                            updated += 1
+                if commit_every and start + batch_size < len(oids):
+                    self.editor.commit()
+        return UpdateResult(updated, len(oids) - updated)
+    
     def __delitem__(self, idx: int | str | Iterable[str] | Iterable[int]) -> str:
         if isinstance(idx, int):
             with self.editor:
-                with self.update_cursor(where_clause=f"{self.OIDField} = {idx}") as cursor:
+                with self._cursor("update", where_clause=f"{self.OIDField} = {idx}") as cursor:
                     for _ in cursor: cursor.deleteRow()
+                self.editor.tick()
             return
         
         if isinstance(idx, str) and idx in self.fieldnames:
@@ -295,8 +1062,9 @@ class Table(DescribeModel):
          
         if isinstance(idx, Iterable) and all(oid in self._oid_set for oid in idx):
             with self.editor:
-                with self.update_cursor(where_clause=f"{self.OIDField} IN ({','.join(idx)})") as cursor:
-                    for _ in cursor: cursor.deleteRow()
+                for where_clause in oid_predicates(self.OIDField, idx):
+                    with self._cursor("update", where_clause=where_clause) as cursor:
+                        for _ in cursor: cursor.deleteRow()
             return
         
         raise KeyError(f"{idx} not in {self.valid_fields}")
@@ -323,7 +1091,7 @@ class Table(DescribeModel):
         if (prefix and ";" in prefix) or (postfix and ";" in postfix): 
             raise SQLError("SQL Injection detected")
         try:
-            yield from as_dict(self.search_cursor(sql_clause=(prefix, postfix)))
+            yield from self.row_factory(self.search_cursor(sql_clause=(prefix, postfix)))
         except RuntimeError as sql_error:
             raise SQLError(f"""Invalid SQL Clause ({prefix} {postfix})\
                     \nMake sure your databse supports TOP, ORDER BY and DISTINCT\
@@ -367,6 +1135,8 @@ class Table(DescribeModel):
         kwargs: See UpdateCursor for kwargs
         return: update cursor
         """
+        # Any row can be changed through the cursor
+        self._row_cache.clear()
         return self._cursor("update", fields, **kwargs)
     
     def search_cursor(self, fields: list[str]=ALL_FIELDS, **kwargs) -> SearchCursor:
@@ -393,6 +1163,9 @@ class Table(DescribeModel):
         arcpy.management.AddField(self.path, field_name, **kwargs)
         self.fieldnames.append(field_name)
         self.fields[field_name], *_ = arcpy.ListFields(self.path, field_name)
+        self.__dict__.pop("valid_fields", None)
+        self.__dict__.pop("fingerprint", None)
+        self._row_cache.clear()
         return
     
     def delete_field(self, field_name: str, _update=True) -> None:
@@ -402,10 +1175,262 @@ class Table(DescribeModel):
         arcpy.management.DeleteField(self.path, field_name)
         self.fieldnames.remove(field_name)
         self.fields.pop(field_name)
+        self.__dict__.pop("valid_fields", None)
+        self.__dict__.pop("fingerprint", None)
+        self._row_cache.clear()
+        return
+    
+    def numpy_dtype(self, fields: list[str]=ALL_FIELDS) -> np.dtype:
+        """ Structured NumPy dtype for a list of fields and cursor tokens 
+        Fields and tokens without a fixed size type (geometry, blobs, rasters) are stored as objects
+        """
+        if fields is Table.ALL_FIELDS or fields == ["*"]:
+            fields = self.fieldnames
+        dtypes = []
+        for name in fields:
+            field = self.fields.get(name)
+            if field is None:
+                dtypes.append((name, TOKEN_DTYPES.get(name, "O")))
+            elif field.type == "String":
+                dtypes.append((name, f"<U{max(field.length, 1)}"))
+            else:
+                dtypes.append((name, FIELD_DTYPES.get(field.type, "O")))
+        return np.dtype(dtypes)
+    
+    def iter_numpy(self, fields: list[str]=ALL_FIELDS, *, 
+                   where: str = None, 
+                   chunk_size: int = 100_000, 
+                   null_value: Any | Mapping[str, Any] = None, 
+                   **kwargs) -> Generator[np.ndarray, None, None]:
+        """ Yield structured NumPy arrays of at most chunk_size rows
+        fields: list of fields and cursor tokens to read
+        where: where clause (combined with the table query, the spatial filter is also applied)
+        null_value: value or {field: value} used in place of nulls. Without one, nulls become
+                    NaN for floats, NaT for dates, "" for strings and raise ValueError for integers
+        kwargs: See SearchCursor for kwargs
+        
+        usage:
+        >>> for chunk in table.iter_numpy(["OID@", "LENGTH"], where="LENGTH > 10"):
+        >>>     total += chunk["LENGTH"].sum()
+        """
+        dtype = self.numpy_dtype(fields)
+        if where is not None:
+            kwargs["where_clause"] = where
+        with self.search_cursor(list(dtype.names), **kwargs) as cursor:
+            while rows := list(islice(cursor, chunk_size)):
+                yield _structured_array(rows, dtype, null_value)
+    
+    def to_numpy(self, fields: list[str]=ALL_FIELDS, *, where: str = None, null_value: Any | Mapping[str, Any] = None, **kwargs) -> np.ndarray:
+        """ Read fields into a single structured NumPy array (see iter_numpy) """
+        chunks = list(self.iter_numpy(fields, where=where, null_value=null_value, **kwargs))
+        if not chunks:
+            return np.empty(0, dtype=self.numpy_dtype(fields))
+        return np.concatenate(chunks)
+    
+    def columns(self, fields: list[str]=ALL_FIELDS, *, where: str = None, null_value: Any | Mapping[str, Any] = None, **kwargs) -> dict[str, np.ndarray]:
+        """ Read fields into a {field: array} dictionary of contiguous per field arrays (see iter_numpy) """
+        array = self.to_numpy(fields, where=where, null_value=null_value, **kwargs)
+        return {name: np.ascontiguousarray(array[name]) for name in array.dtype.names}
+    
+    def arrow_schema(self, fields: list[str] = None) -> "pa.Schema":
+        """ Arrow schema of the fields and the geometry (WKB) of the table
+        fields: attribute fields (default is all fields that can be stored in Arrow)
+        
+        The geometry column is named after the shape field and stored as WKB with GeoParquet 
+        metadata. arcpy can't write PROJJSON, so the GeoParquet crs is left unknown (null) unless
+        the data is WGS84 and the Esri WKT of the spatial reference is stored in the
+        "esri:spatial_reference" schema metadata instead.
+        """
+        pa = _import_pyarrow()
+        if fields is None:
+            fields = [name for name, field in self.fields.items() if field.type in ARROW_TYPES]
+        columns = []
+        for name in fields:
+            type_name, *args = ARROW_TYPES.get(self.fields[name].type, ("string",))
+            columns.append(pa.field(name, getattr(pa, type_name)(*args), nullable=self.fields[name].isNullable))
+        metadata = {}
+        shape_field = getattr(self, "shapeFieldName", None)
+        if shape_field:
+            columns.append(pa.field(shape_field, pa.binary()))
+            column = {"encoding": "WKB", "geometry_types": []}
+            if self.spatialReference.factoryCode != WGS84:
+                # A missing crs means OGC:CRS84 in GeoParquet
+                column["crs"] = None
+            metadata["geo"] = json.dumps(
+                {
+                    "version": "1.0.0",
+                    "primary_column": shape_field,
+                    "columns": {shape_field: column},
+                }
+            )
+            metadata["esri:spatial_reference"] = self.spatialReference.exportToString()
+        return pa.schema(columns, metadata=metadata)
+    
+    def iter_record_batches(self, fields: list[str] = None, *, 
+                            batch_size: int = 100_000, 
+                            **kwargs) -> Generator["pa.RecordBatch", None, None]:
+        """ Read the table into Arrow record batches of batch_size rows (geometry as WKB)
+        fields: attribute fields (default is all fields that can be stored in Arrow)
+        kwargs: See SearchCursor for kwargs (the table query and spatial filter are applied)
+        """
+        pa = _import_pyarrow()
+        schema = self.arrow_schema(fields)
+        shape_field = getattr(self, "shapeFieldName", None)
+        cursor_fields = [field.name for field in schema if field.name != shape_field]
+        if shape_field:
+            cursor_fields.append("SHAPE@WKB")
+        
+        with self.search_cursor(cursor_fields, **kwargs) as cursor:
+            while rows := list(islice(cursor, batch_size)):
+                columns = list(zip(*rows))
+                if shape_field:
+                    columns[-1] = [bytes(shape) if shape is not None else None for shape in columns[-1]]
+                yield pa.RecordBatch.from_arrays(
+                    [pa.array(column, type=field.type) for column, field in zip(columns, schema)], 
+                    schema=schema)
         return
     
+    def to_arrow(self, fields: list[str] = None, *, batch_size: int = 100_000, **kwargs) -> "pa.Table":
+        """ Read the table into an Arrow Table (see iter_record_batches) """
+        pa = _import_pyarrow()
+        return pa.Table.from_batches(
+            self.iter_record_batches(fields, batch_size=batch_size, **kwargs), 
+            schema=self.arrow_schema(fields))
+    
+    def to_parquet(self, path: os.PathLike, fields: list[str] = None, *, 
+                   batch_size: int = 100_000, 
+                   compression: str = "zstd", 
+                   **kwargs) -> int:
+        """ Write the table to a Parquet file one record batch at a time (see iter_record_batches)
+        return: number of rows written
+        """
+        _import_pyarrow()
+        import pyarrow.parquet as pq
+        count = 0
+        with pq.ParquetWriter(path, self.arrow_schema(fields), compression=compression) as writer:
+            for batch in self.iter_record_batches(fields, batch_size=batch_size, **kwargs):
+                writer.write_batch(batch)
+                count += batch.num_rows
+        return count
+    
+    def insert_batches(self, batches: Iterable["pa.RecordBatch"]) -> int:
+        """ Insert Arrow record batches into the table
+        Columns are matched to editable fields by name, the column named after the shape field 
+        is inserted as WKB. Other columns (e.g. the OID) are ignored.
+        return: number of rows inserted
+        """
+        shape_field = getattr(self, "shapeFieldName", None)
+        count = 0
+        with self.editor:
+            for batch in batches:
+                names = \
+                    [
+                        name for name in batch.schema.names 
+                        if name == shape_field 
+                        or (name in self.fields and self.fields[name].editable and self.fields[name].type in ARROW_TYPES 
+                            and self.fields[name].type not in ("OID", "GlobalID"))
+                    ]
+                cursor_fields = ["SHAPE@WKB" if name == shape_field else name for name in names]
+                columns = [batch.column(name).to_pylist() for name in names]
+                with self._cursor("insert", cursor_fields) as cursor:
+                    for row in zip(*columns):
+                        cursor.insertRow(row)
+                count += batch.num_rows
+                self.editor.tick(batch.num_rows)
+        return count
+    
+    def load_parquet(self, path: os.PathLike, *, batch_size: int = 100_000) -> int:
+        """ Insert the rows of a Parquet file into the table (memory mapped and read batch_size rows at a time)
+        return: number of rows inserted
+        """
+        _import_pyarrow()
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(path, memory_map=True)
+        return self.insert_batches(parquet.iter_batches(batch_size=batch_size))
+    
+    def dump_json(self, fp: TextIO, format: Literal["esri", "geojson", "ndjson"] = "esri", *, 
+                  fields: list[str] = None, 
+                  chunk_size: int = 1000, 
+                  **kwargs) -> int:
+        """ Stream the rows of the table to a file-like object as Esri JSON, GeoJSON or newline delimited GeoJSON
+        fp: writable text file-like object
+        format: "esri" (FeatureSet JSON), "geojson" (FeatureCollection) or "ndjson" (one GeoJSON Feature per line)
+        fields: attribute fields to write (default is all fields that are not geometry, raster or blob fields)
+        chunk_size: number of features written to fp at a time
+        kwargs: See SearchCursor for kwargs (GeoJSON geometries are projected to WGS84 unless spatial_reference is set)
+        return: number of features written
+        
+        Rows are read with a search cursor that honors the query and spatial filter of the table, 
+        so memory use does not depend on the size of the table.
+        
+        usage:
+        >>> with open("roads.geojson", "w") as f:
+        ...     roads.dump_json(f, "geojson")
+        """
+        if format not in JSON_FORMATS:
+            raise ValueError(f"format must be one of {JSON_FORMATS}")
+        if fields is None:
+            fields = [name for name, field in self.fields.items() if field.type not in NON_JSON_FIELD_TYPES]
+        geojson = format != "esri"
+        shape_token = None
+        if getattr(self, "shapeFieldName", None):
+            shape_token = "SHAPE@" if geojson else "SHAPE@JSON"
+            if geojson:
+                kwargs.setdefault("spatial_reference", arcpy.SpatialReference(4326))
+        
+        dumps = partial(json.dumps, default=_json_iso_default if geojson else _json_epoch_default)
+        if format == "esri":
+            header, separator, footer = f"{dumps(self._esri_json_header(fields))[:-1]}, \"features\": [", ",", "]}"
+        elif format == "geojson":
+            header, separator, footer = '{"type": "FeatureCollection", "features": [', ",", "]}"
+        else:
+            header, separator, footer = "", "\n", "\n"
+        
+        def features(cursor: SearchCursor) -> Generator[str, None, None]:
+            for row in cursor:
+                attributes = dict(zip(fields, row))
+                shape = row[-1] if shape_token else None
+                if geojson:
+                    geometry = shape.__geo_interface__ if shape else None
+                    yield dumps({"type": "Feature", "properties": attributes, "geometry": geometry})
+                else:
+                    # SHAPE@JSON is already serialized
+                    yield f'{{"attributes": {dumps(attributes)}, "geometry": {shape or "null"}}}'
+        
+        count = 0
+        fp.write(header)
+        with self.search_cursor([*fields, shape_token] if shape_token else fields, **kwargs) as cursor:
+            rows = features(cursor)
+            while chunk := list(islice(rows, chunk_size)):
+                fp.write((separator if count else "") + separator.join(chunk))
+                count += len(chunk)
+        fp.write(footer if count or format != "ndjson" else "")
+        return count
+    
+    def _esri_json_header(self, fields: list[str]) -> dict[str, Any]:
+        """ FeatureSet properties of Esri JSON (without the features) """
+        header: dict[str, Any] = {"displayFieldName": "", "fieldAliases": {}}
+        if getattr(self, "shapeFieldName", None):
+            spatial_reference = self.spatialReference
+            header["geometryType"] = ESRI_GEOMETRY_TYPES.get(self.shapeType, f"esriGeometry{self.shapeType}")
+            header["spatialReference"] = \
+                {"wkid": spatial_reference.factoryCode} if spatial_reference.factoryCode else {"wkt": spatial_reference.exportToString()}
+        header["fieldAliases"] = {name: self.fields[name].aliasName for name in fields if name in self.fields}
+        header["fields"] = \
+            [
+                {
+                    "name": name, 
+                    "type": f"esriFieldType{self.fields[name].type}", 
+                    "alias": self.fields[name].aliasName,
+                    **({"length": self.fields[name].length} if self.fields[name].type == "String" else {}),
+                }
+                for name in fields if name in self.fields
+            ]
+        return header
+    
     def to_json(self, **kwargs) -> str:
         """ returns a json string of the Table/Features
+        kwargs: See FeaturesToJSON for kwargs (use dump_json to stream large tables)
         """
         out_file = arcpy.conversion.FeaturesToJSON(
             in_features=self.path, 
@@ -420,13 +1445,112 @@ class Table(DescribeModel):
         """
         return self.to_json(geoJSON=True, **kwargs)
     
+class ChainedCursor:
+    """ Reads a sequence of cursors as one cursor (one cursor pass per where clause)
+        
+        Each cursor is opened when the previous one is exhausted. All other attributes
+        (fields, updateRow, deleteRow) are passed through to the open cursor
+    """
+    
+    def __init__(self, cursors: list[Callable[[], SearchCursor | UpdateCursor]]):
+        self._cursors = cursors
+        self._idx = 0
+        self._cursor = cursors[0]()
+        return
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+    
+    def __enter__(self) -> Self:
+        self._cursor.__enter__()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._cursor.__exit__(exc_type, exc_value, traceback)
+    
+    def __iter__(self) -> Self:
+        return self
+    
+    def __next__(self) -> tuple:
+        while True:
+            try:
+                return next(self._cursor)
+            except StopIteration:
+                if self._idx + 1 >= len(self._cursors):
+                    raise
+            self._open(self._idx + 1)
+    
+    def _open(self, idx: int) -> None:
+        self._cursor.__exit__(None, None, None)
+        self._idx = idx
+        self._cursor = self._cursors[idx]()
+        return
+    
+    def reset(self) -> None:
+        self._open(0)
+        return
+
+class TrackedCursor:
+    """ Wrapper for update and insert cursors that keeps the record count and OID index
+        of the parent table up to date as rows are inserted, updated and deleted
+        
+        All other attributes are passed through to the wrapped cursor
+    """
+    
+    def __init__(self, table: Table, cursor: UpdateCursor | InsertCursor):
+        self._table = table
+        self._cursor = cursor
+        self._row: tuple = None
+        self._oid_idx: int | None = None
+        for token in ("OID@", table.OIDField):
+            if token in cursor.fields:
+                self._oid_idx = cursor.fields.index(token)
+                break
+        return
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+    
+    def __enter__(self) -> Self:
+        self._cursor.__enter__()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._cursor.__exit__(exc_type, exc_value, traceback)
+    
+    def __iter__(self) -> Self:
+        return self
+    
+    def __next__(self) -> tuple:
+        self._row = next(self._cursor)
+        return self._row
+    
+    def insertRow(self, row: Iterable[Any]) -> int:
+        oid = self._cursor.insertRow(row)
+        self._table._track_insert(oid)
+        return oid
+    
+    def updateRow(self, row: Iterable[Any]) -> None:
+        self._cursor.updateRow(row)
+        self._table._track_update()
+        return
+    
+    def deleteRow(self) -> None:
+        self._cursor.deleteRow()
+        oid = self._row[self._oid_idx] if self._row is not None and self._oid_idx is not None else None
+        self._table._track_delete(oid)
+        return
+
 class FeatureClass(Table):
     """ Wrapper for basic FeatureClass operations """    
-    def __init__(self, path: os.PathLike):
-        super().__init__(path)
+    def __init__(self, path: os.PathLike, *, lazy: bool = False):
+        # Fields are loaded after the shape tokens are registered
+        super().__init__(path, lazy=True)
+        self.lazy = lazy
         self.describe: typdesc.FeatureClass = self.describe
         self.spatialReference: arcpy.SpatialReference = self.describe.spatialReference
         self.shapeType: str = self.describe.shapeType
+        self.shapeFieldName: str = self.describe.shapeFieldName
         self.cursor_tokens.extend(
             [
                 "SHAPE@",
@@ -443,12 +1567,20 @@ class FeatureClass(Table):
                 "SHAPE@LENGTH",
             ]
         )
-        self.valid_fields = self.fieldnames + self.cursor_tokens
-        self.fieldnames[self.fieldnames.index(self.describe.shapeFieldName)] = "SHAPE@"
+        if not lazy:
+            self._load()
+        return
+    
+    @cached_property
+    def fieldnames(self) -> list[str]:
+        """ Names of the fields in the featureclass (shape field is replaced by SHAPE@) """
+        fieldnames = list(self.fields.keys())
+        fieldnames[fieldnames.index(self.shapeFieldName)] = "SHAPE@"
+        return fieldnames
       
 class ShapeFile(FeatureClass):
-    def __init__(self, path: os.PathLike):
-        super().__init__(path)
+    def __init__(self, path: os.PathLike, *, lazy: bool = False):
+        super().__init__(path, lazy=lazy)
         self.describe: typdesc.ShapeFile = self.describe
         return
 
@@ -465,39 +1597,43 @@ class Workspace(DescribeModel):
     def __init__(self, path: os.PathLike, *,
                  dataset_filter: list[str]=ALL,
                  featureclass_filter: list[str]=ALL,
-                 table_filter: list[str]=ALL):
+                 table_filter: list[str]=ALL,
+                 lazy: bool=True,
+                 catalog_index: "CatalogIndex"=None):
         super().__init__(path)
         self.describe: typdesc.Workspace = self.describe
         
+        # Children are initialized in lazy mode unless specified
+        self.lazy = lazy
         self.dataset_filter = dataset_filter
         self.featureclass_filter = featureclass_filter
         self.table_filter = table_filter
-        arcpy.env.workspace = self.path
+        
+        # Children being warmed by prefetch
+        self._pending: dict[str, Future] = {}
+        
+        # Children are read from the catalog index instead of the List functions so
+        # arcpy.env.workspace is not changed and unchanged workspaces are not listed again
+        catalog_index = catalog_index or CatalogIndex.shared()
+        self.catalog: dict[str, dict[str, dict[str, Any]]] = catalog_index.catalog(self.path)
         self.datasets: dict[str, FeatureDataset] = \
             {
-                ds: os.path.join(self.path, ds)
-                for ds in arcpy.ListDatasets()
-                if dataset_filter == ALL or (dataset_filter and ds in dataset_filter)
+                ds: child["path"]
+                for ds, child in self.catalog["datasets"].items()
+                if in_filter(ds, dataset_filter)
             }
         self.featureclasses: dict[str, FeatureClass] = \
             {
-                fc: os.path.join(self.path, fc)
-                for fc in arcpy.ListFeatureClasses()
-                if featureclass_filter == ALL or (featureclass_filter and fc in featureclass_filter)
+                fc: child["path"]
+                for fc, child in self.catalog["featureclasses"].items()
+                if in_filter(fc.split("/")[-1], featureclass_filter)
+                and ("/" not in fc or fc.split("/")[0] in self.datasets)
             }
-        for ds in self.datasets.keys():
-            self.featureclasses.update(
-                {
-                    f"{ds}/{fc}": os.path.join(self.path, ds, fc)
-                    for fc in arcpy.ListFeatureClasses(feature_dataset=ds)
-                    if featureclass_filter == ALL or (featureclass_filter and fc in featureclass_filter)
-                }
-            )
         self.tables: dict[str, Table] = \
             {
-                tbl: os.path.join(self.path, tbl)
-                for tbl in arcpy.ListTables()
-                if table_filter == ALL or (table_filter and tbl in table_filter)
+                tbl: child["path"]
+                for tbl, child in self.catalog["tables"].items()
+                if in_filter(tbl, table_filter)
             }
         return
     
@@ -513,18 +1649,71 @@ class Workspace(DescribeModel):
     \tTables:{list(self.tables.keys())}
     \tDatasets:{list(self.datasets.keys())}"""
     
+    def prefetch(self, names: Iterable[str] = None, *, max_workers: int = 4) -> Self:
+        """ Warm the Describe, fields and count of children on a background thread pool
+        
+        Children are built and stored in the workspace as soon as they are warmed, accessing a 
+        child that is still being warmed waits for it. Defaults to all featureclasses and tables.
+        
+        usage:
+        >>> gdb = Workspace(path).prefetch()
+        >>> ... # Other work while the children are read
+        >>> len(gdb["Roads"])  # Waits only if Roads is not ready yet
+        """
+        names = [name for name in (names if names is not None else [*self.featureclasses, *self.tables])
+                 if name not in self._pending and not isinstance(self._child(name), DescribeModel)]
+        if not names:
+            return self
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        for name in names:
+            future = executor.submit(self._warm, name)
+            future.add_done_callback(partial(self._prefetched, name))
+            self._pending[name] = future
+        # Don't wait for the pool, the futures finish in the background
+        executor.shutdown(wait=False)
+        return self
+    
+    def _child(self, name: str) -> os.PathLike | Table | None:
+        return self.featureclasses.get(name, self.tables.get(name))
+    
+    def _warm(self, name: str) -> Table:
+        """ Build a child and read its lazy metadata slots """
+        path = self._child(name)
+        child = FeatureClass(path, lazy=True) if name in self.featureclasses else Table(path, lazy=True)
+        for attr in ("fields", "fieldnames", "record_count", "fingerprint"):
+            getattr(child, attr)
+        return child
+    
+    def _prefetched(self, name: str, future: Future) -> None:
+        """ Store a warmed child (failed children are built normally on access) """
+        if future.cancelled() or future.exception() is not None:
+            return
+        child = future.result()
+        child.lazy = self.lazy
+        if name in self.featureclasses:
+            self.featureclasses[name] = child
+        else:
+            self.tables[name] = child
+        return
+    
     def __getitem__(self, idx: str) -> FeatureClass | Table | FeatureDataset:
+        if (pending := self._pending.pop(idx, None)) is not None:
+            # Waiters can wake before the done callback runs, so the child is stored here as well
+            wait([pending])
+            if pending.exception() is None:
+                self._prefetched(idx, pending)
         # Doing some lazy loading here to prevent initializing all the children
         # This distributes the ~ 5 seconds of initialization time across the
         # number of children in the workspace and only initializes the child
-        # when it is first accessed.
+        # when it is first accessed. In lazy mode the child defers its own
+        # field, count and OID reads until they are used.
         if idx in self.featureclasses:
             if not isinstance(self.featureclasses[idx], FeatureClass):
-                self.featureclasses[idx] = FeatureClass(self.featureclasses[idx])
+                self.featureclasses[idx] = FeatureClass(self.featureclasses[idx], lazy=self.lazy)
             return self.featureclasses[idx]
         if idx in self.tables:
             if not isinstance(self.tables[idx], Table):
-                self.tables[idx] = Table(self.tables[idx])
+                self.tables[idx] = Table(self.tables[idx], lazy=self.lazy)
             return self.tables[idx]
         if idx in self.datasets:
             if not isinstance(self.datasets[idx], FeatureDataset):
@@ -536,6 +1725,16 @@ class Workspace(DescribeModel):
         """ Override the equality operator to compare children """
         return (*self.featureclasses, *self.tables) == (*other.featureclasses, *other.tables)
     
+    @property
+    def fingerprints(self) -> dict[str, str]:
+        """ Schema fingerprints of the featureclasses and tables in the workspace """
+        return {name: self[name].fingerprint for name in (*self.featureclasses, *self.tables)}
+    
+    @property
+    def fingerprint(self) -> str:
+        """ Hash of the child names and their schema fingerprints """
+        return schema_fingerprint(list(self.fingerprints.items()))
+    
     def __or__(self, other: Self) -> list[str]:
         """ Set style override that gives the union of two workspaces children """
         return list(set([*self.featureclasses, *self.tables]) | set([*other.featureclasses, *other.tables]))
@@ -548,6 +1747,349 @@ class Workspace(DescribeModel):
         """ Set style override that gives the difference of two workspaces children """
         return list(set([*self.featureclasses, *self.tables]) - set([*other.featureclasses, *other.tables]))
 
+def in_filter(name: str, name_filter: list[str]) -> bool:
+    """ Check a child name against a Workspace filter (ALL passes everything, None passes nothing) """
+    return name_filter is ALL or bool(name_filter and name in name_filter)
+
+def schema_fingerprint(*parts: Any) -> str:
+    """ Stable hash of JSON serializable schema parts """
+    return hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()
+
+def workspace_stamp(path: os.PathLike) -> float | None:
+    """ Latest modification time of a folder based workspace (e.g. a file geodatabase)
+    Lock files are ignored. Returns None for workspaces that are not folders (e.g. .sde connections)
+    """
+    if not os.path.isdir(path):
+        return None
+    with os.scandir(path) as entries:
+        return max(
+            (entry.stat().st_mtime for entry in entries if not entry.name.endswith(".lock")),
+            default=os.stat(path).st_mtime
+        )
+
+class JSONCache:
+    """ On disk cache of JSON values keyed by path and stamped with the path modification time
+    
+    usage:
+    >>> cache = JSONCache("cache.json")
+    >>> value = cache.get(path, workspace_stamp(path))
+    >>> if value is None:
+    >>>     value = expensive(path)
+    >>>     cache.set(path, workspace_stamp(path), value)
+    """
+    
+    # Seconds to wait for another process to finish writing the cache file
+    LOCK_TIMEOUT = 5.0
+    # Lock files older than this are left over from a crashed process and are removed
+    STALE_LOCK = 60.0
+    
+    def __init__(self, cache_file: os.PathLike):
+        self.cache_file = Path(cache_file)
+        self._entries: dict[str, dict[str, Any]] = self._read_file()
+        # Keys changed or removed by this instance, merged into the file on save
+        self._changed: set[str] = set()
+        self._removed: set[str] = set()
+        return
+    
+    def _read_file(self) -> dict[str, dict[str, Any]]:
+        if not self.cache_file.exists():
+            return {}
+        try:
+            return json.loads(self.cache_file.read_text())
+        except (OSError, ValueError) as e:
+            print(f"Discarding unreadable cache {self.cache_file}\n{e}", severity="WARNING")
+        return {}
+    
+    @staticmethod
+    def _key(path: os.PathLike) -> str:
+        return os.path.normcase(os.path.abspath(path))
+    
+    def get(self, path: os.PathLike, stamp: float | None) -> Any:
+        """ Get the cached value for path if the stamp matches (None stamps are never cached) """
+        entry = self._entries.get(self._key(path))
+        if stamp is None or not entry or entry["stamp"] != stamp:
+            return None
+        return entry["value"]
+    
+    def set(self, path: os.PathLike, stamp: float | None, value: Any) -> None:
+        """ Store a value for path and write the cache to disk """
+        if stamp is None:
+            return
+        self._store(path, {"stamp": stamp, "value": value})
+        self.save()
+        return
+    
+    def _store(self, path: os.PathLike, entry: dict[str, Any]) -> None:
+        key = self._key(path)
+        self._entries[key] = entry
+        self._changed.add(key)
+        self._removed.discard(key)
+        return
+    
+    def _remove(self, path: os.PathLike) -> bool:
+        key = self._key(path)
+        if self._entries.pop(key, None) is None:
+            return False
+        self._removed.add(key)
+        self._changed.discard(key)
+        return True
+    
+    def save(self) -> None:
+        """ Merge the changes of this instance into the cache file and atomically replace it
+        
+        The cache file can be shared by multiple processes (e.g. GDBMerger workers), so the
+        write is done under a lock file through a unique temp file. Failing to write the cache 
+        is not fatal, the changes are kept in memory and written on the next save.
+        """
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock():
+                entries = self._read_file()
+                entries.update({key: self._entries[key] for key in self._changed})
+                for key in self._removed:
+                    entries.pop(key, None)
+                descriptor, temp_file = tempfile.mkstemp(dir=self.cache_file.parent, prefix=f"{self.cache_file.stem}.", suffix=".tmp")
+                try:
+                    with os.fdopen(descriptor, "w") as f:
+                        json.dump(entries, f)
+                    os.replace(temp_file, self.cache_file)
+                except BaseException:
+                    Path(temp_file).unlink(missing_ok=True)
+                    raise
+            self._entries = entries
+            self._changed.clear()
+            self._removed.clear()
+        except (OSError, TimeoutError) as e:
+            print(f"Could not write cache {self.cache_file}\n{e}", severity="WARNING")
+        return
+    
+    @contextmanager
+    def _lock(self) -> Generator[None, None, None]:
+        """ Exclusive lock file next to the cache file """
+        lock_file = self.cache_file.with_suffix(".lock")
+        deadline = time.monotonic() + self.LOCK_TIMEOUT
+        while True:
+            try:
+                descriptor = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lock_file.stat().st_mtime > self.STALE_LOCK:
+                        lock_file.unlink(missing_ok=True)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for {lock_file}")
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            os.close(descriptor)
+            lock_file.unlink(missing_ok=True)
+        return
+
+CATALOG_INDEX_FILE = Path(tempfile.gettempdir()) / "pytframe2" / "catalog_index.json"
+
+class CatalogIndex(JSONCache):
+    """ Children of workspaces with their paths and basic Describe metadata
+    
+    Catalogs of folder based workspaces (file geodatabases) are reused while the workspace
+    modification stamp is unchanged. Otherwise (or for workspaces without a stamp, e.g. 
+    enterprise geodatabases) the child names are listed again with arcpy.da.Walk and only 
+    new children are described, removed children are dropped from the index.
+    
+    usage:
+    >>> index = CatalogIndex.shared()
+    >>> index.catalog(gdb)["featureclasses"]
+    {'Roads': {'path': '...gdb\\Roads', 'dataType': 'FeatureClass', 'shapeType': 'Polyline'}, ...}
+    """
+    
+    _shared: "CatalogIndex" = None
+    
+    def __init__(self, cache_file: os.PathLike = CATALOG_INDEX_FILE):
+        super().__init__(cache_file)
+        return
+    
+    @classmethod
+    def shared(cls) -> "CatalogIndex":
+        """ Index that is shared by all Workspaces that don't specify one """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    
+    def catalog(self, path: os.PathLike, *, refresh: bool = False) -> dict[str, dict[str, dict[str, Any]]]:
+        """ Catalog of a workspace {"datasets": {...}, "featureclasses": {...}, "tables": {...}}
+        refresh re-describes every child instead of only the new ones
+        """
+        stamp = workspace_stamp(path)
+        entry = self._entries.get(self._key(path))
+        if entry and not refresh and stamp is not None and entry["stamp"] == stamp:
+            return entry["value"]
+        
+        known = entry["value"] if entry and not refresh else {}
+        catalog = \
+            {
+                kind: {
+                    name: known.get(kind, {}).get(name) or describe_child(child_path)
+                    for name, child_path in children.items()
+                }
+                for kind, children in walk_workspace(path).items()
+            }
+        # Unlike JSONCache.set, workspaces without a stamp are stored for the incremental refresh
+        self._store(path, {"stamp": stamp, "value": catalog})
+        self.save()
+        return catalog
+    
+    def invalidate(self, path: os.PathLike) -> None:
+        """ Drop a workspace from the index """
+        if self._remove(path):
+            self.save()
+        return
+
+def walk_workspace(path: os.PathLike) -> dict[str, dict[str, str]]:
+    """ Paths of the datasets, featureclasses and tables of a workspace by child name
+    Featureclasses in a feature dataset are named "<dataset>/<featureclass>". Uses arcpy.da.Walk
+    so arcpy.env.workspace is not changed. Only the workspace and its feature datasets are walked.
+    """
+    path = os.fspath(path)
+    children: dict[str, dict[str, str]] = {"datasets": {}, "featureclasses": {}, "tables": {}}
+    # Folders of shapefiles are not searched recursively (same as ListFeatureClasses)
+    file_system = arcpy.Describe(path).workspaceType == "FileSystem"
+    for kind, datatype in (("featureclasses", "FeatureClass"), ("tables", "Table")):
+        for dirpath, dirnames, filenames in arcpy.da.Walk(path, datatype=datatype):
+            if os.path.normcase(dirpath) == os.path.normcase(path):
+                prefix = ""
+                if kind == "featureclasses" and not file_system:
+                    children["datasets"].update({ds: os.path.join(path, ds) for ds in dirnames})
+                else:
+                    # Tables are never stored in feature datasets
+                    dirnames.clear()
+            else:
+                prefix = f"{os.path.basename(dirpath)}/"
+                # Feature datasets can not be nested
+                dirnames.clear()
+            children[kind].update({f"{prefix}{name}": os.path.join(dirpath, name) for name in filenames})
+    return children
+
+def describe_child(path: os.PathLike) -> dict[str, Any]:
+    """ Basic Describe metadata of a workspace child """
+    desc = arcpy.Describe(path)
+    return \
+        {
+            "path": os.fspath(path),
+            "dataType": desc.dataType,
+            "shapeType": getattr(desc, "shapeType", None),
+        }
+
+SCHEMA_CACHE_FILE = Path(tempfile.gettempdir()) / "pytframe2" / "schema_cache.json"
+
+class SchemaCache(JSONCache):
+    """ Schema fingerprints of workspace children cached by workspace path and modification time
+    
+    Lets unchanged workspaces be compared without opening them
+    
+    usage:
+    >>> cache = SchemaCache()
+    >>> cache.fingerprints(gdb_a) == cache.fingerprints(gdb_b)
+    True
+    """
+    
+    def __init__(self, cache_file: os.PathLike = SCHEMA_CACHE_FILE):
+        super().__init__(cache_file)
+        return
+    
+    def _read(self, path: os.PathLike) -> dict[str, dict[str, str]]:
+        stamp = workspace_stamp(path)
+        schema = self.get(path, stamp)
+        if schema is None:
+            workspace = Workspace(path, lazy=True)
+            schema = \
+                {
+                    "featureclasses": {name: workspace[name].fingerprint for name in workspace.featureclasses},
+                    "tables": {name: workspace[name].fingerprint for name in workspace.tables},
+                }
+            self.set(path, stamp, schema)
+        return schema
+    
+    def fingerprints(self, path: os.PathLike, *,
+                     featureclass_filter: list[str]=ALL,
+                     table_filter: list[str]=ALL) -> dict[str, str]:
+        """ Fingerprints of the workspace children in Workspace order using the Workspace filter rules """
+        schema = self._read(path)
+        return \
+            {
+                **{
+                    name: fingerprint 
+                    for name, fingerprint in schema["featureclasses"].items() 
+                    if in_filter(name.split("/")[-1], featureclass_filter)
+                },
+                **{
+                    name: fingerprint 
+                    for name, fingerprint in schema["tables"].items() 
+                    if in_filter(name, table_filter)
+                },
+            }
+    
+    def fingerprint(self, path: os.PathLike, **filters: list[str]) -> str:
+        """ Workspace fingerprint (see Workspace.fingerprint) """
+        return schema_fingerprint(list(self.fingerprints(path, **filters).items()))
+
+def _import_pyarrow():
+    """ Import pyarrow (optional, only needed for the Arrow/Parquet methods of Table) """
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("pyarrow is required for Arrow and Parquet support (conda install pyarrow)") from e
+    return pyarrow
+
+def _json_iso_default(value: Any) -> Any:
+    """ JSON encoder fallback for GeoJSON (dates as ISO 8601 strings) """
+    if isinstance(value, (datetime, date, datetime_time)):
+        return value.isoformat()
+    return str(value)
+
+def _json_epoch_default(value: Any) -> Any:
+    """ JSON encoder fallback for Esri JSON (dates as epoch milliseconds) 
+    arcpy returns naive datetimes, they are encoded as UTC like FeaturesToJSON does
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    if isinstance(value, (date, datetime_time)):
+        return value.isoformat()
+    return str(value)
+
+def _structured_array(rows: list[tuple], dtype: np.dtype, null_value: Any | Mapping[str, Any] = None) -> np.ndarray:
+    """ Convert cursor rows to a structured array, filling nulls (see Table.iter_numpy) """
+    array = np.empty(len(rows), dtype=dtype)
+    for name, column in zip(dtype.names, zip(*rows)):
+        if None in column:
+            field_dtype = dtype[name].base
+            if isinstance(null_value, Mapping) and name in null_value:
+                fill = null_value[name]
+            elif null_value is not None and not isinstance(null_value, Mapping):
+                fill = null_value
+            elif field_dtype.kind == "f":
+                fill = np.nan
+            elif field_dtype.kind == "M":
+                fill = np.datetime64("NaT")
+            elif field_dtype.kind == "U":
+                fill = ""
+            elif field_dtype.kind == "O":
+                fill = None
+            else:
+                raise ValueError(f"{name} contains nulls, pass a null_value for it")
+            if dtype[name].shape:
+                fill = np.full(dtype[name].shape, fill)
+            column = [fill if value is None else value for value in column]
+        if dtype[name].kind == "O":
+            # Prevent NumPy from unpacking sequence values (e.g. geometries) into new dimensions
+            column = np.fromiter(column, dtype=object, count=len(rows))
+        array[name] = column
+    return array
+
 def as_dict(cursor: SearchCursor | UpdateCursor) -> Generator[dict[str, Any], None, None]:
     """Convert a search cursor or update cursor to an iterable dictionary generator
     This allows for each row operation to be done using fieldnames as keys.
@@ -576,5 +2118,65 @@ def as_dict(cursor: SearchCursor | UpdateCursor) -> Generator[dict[str, Any], No
     """
     yield from ( dict(zip(cursor.fields, row)) for row in cursor )
 
+class Row(tuple):
+    """ Read only cursor row that can be indexed by position or by fieldname
+    
+    Row types are built once per cursor by row_type so each row only costs a tuple.
+    Rows behave like a tuple for iteration, unpacking and cursor.updateRow and like 
+    a read only mapping for fieldname access, keys(), values(), items(), get() and dict(row).
+    
+    usage:
+    >>> with table.search_cursor(["OID@", "NAME"]) as cursor:
+    >>>     for row in as_rows(cursor):
+    >>>         print(row["NAME"], row[0])
+    """
+    __slots__ = ()
+    fields: tuple[str, ...] = ()
+    _index: dict[str, int] = {}
+    
+    def __getitem__(self, key: str | int | slice) -> Any:
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._index[key])
+        return tuple.__getitem__(self, key)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._index:
+            return tuple.__getitem__(self, self._index[key])
+        return default
+    
+    def keys(self) -> tuple[str, ...]:
+        return self.fields
+    
+    def values(self) -> Iterator[Any]:
+        return tuple.__iter__(self)
+    
+    def items(self) -> Iterator[tuple[str, Any]]:
+        return zip(self.fields, tuple.__iter__(self))
+    
+    def as_dict(self) -> dict[str, Any]:
+        return dict(self.items())
+    
+    def __repr__(self) -> str:
+        return f"Row({', '.join(f'{field}={value!r}' for field, value in self.items())})"
+
+def row_type(fields: Iterable[str]) -> type[Row]:
+    """ Build a Row subclass for a list of fieldnames """
+    fields = tuple(fields)
+    return type("Row", (Row,), {"__slots__": (), "fields": fields, "_index": {field: idx for idx, field in enumerate(fields)}})
+
+def as_rows(cursor: SearchCursor | UpdateCursor) -> Generator[Row, None, None]:
+    """Convert a search cursor or update cursor to a generator of Row tuples
+    Like as_dict, but the fieldname lookup is built once for the cursor instead of a dictionary per row.
+    
+    usage:
+    >>> with table.search_cursor() as cursor:
+    >>>     for row in as_rows(cursor):
+    >>>         print(row["field"])
+    """
+    yield from map(row_type(cursor.fields), cursor)
+
 if __name__ == "__main__":
     pass
\ No newline at end of file
@@ -1,7 +1,27 @@
+import os
+import sys
+import ast
+import json
+import hashlib
+
+from pathlib import Path
+from types import ModuleType
 from importlib import reload, import_module
+from importlib.util import find_spec
 from traceback import format_exc
+from typing import Any
 from tool import Tool
 
+# Root of the project, only modules with a source file under this directory are reloaded
+ROOT = Path(__file__).parents[1].absolute()
+
+# Source signatures of loaded modules by module name: (mtime_ns, size, sha1)
+# Kept across reloads of this module so changes are detected between toolbox refreshes
+SIGNATURES: dict[str, tuple[int, int, str]] = globals().get("SIGNATURES", {})
+
+# Tool attributes that are stored in the manifest and set on lazy tools without importing them
+MANIFEST_ATTRIBUTES = ("label", "description", "category", "canRunInBackground")
+
 def placeholder_tool(tool_name: str, exception: Exception, traceback: str) -> type[Tool]:
     """ Higher order function for creating a tool class that represents a broken tool. """
     class _BrokenImport(Tool):
@@ -13,25 +33,274 @@ def placeholder_tool(tool_name: str, exception: Exception, traceback: str) -> ty
             self.description = traceback
     return _BrokenImport
 
+def source_signature(path: str, previous: tuple[int, int, str] = None) -> tuple[int, int, str] | None:
+    """ (mtime_ns, size, sha1) of a source file, the file is only hashed if the mtime or size changed """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if previous and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+        return previous
+    with open(path, "rb") as f:
+        return stat.st_mtime_ns, stat.st_size, hashlib.sha1(f.read()).hexdigest()
+
+def project_modules(root: os.PathLike = ROOT) -> dict[str, ModuleType]:
+    """ Loaded modules with a source file under root """
+    root = os.path.join(str(root), "")
+    return \
+        {
+            name: module
+            for name, module in list(sys.modules.items())
+            if isinstance(module, ModuleType)
+            and (getattr(module, "__file__", None) or "").startswith(root)
+        }
+
+def imported_names(module: ModuleType) -> set[str]:
+    """ Names of all modules (and module attributes) imported by the source of a module """
+    try:
+        with open(module.__file__, "rb") as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError, ValueError):
+        return set()
+    package = module.__package__ or ""
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parent = package.rsplit(".", node.level - 1)[0] if node.level > 1 else package
+                base = f"{parent}.{base}".strip(".")
+            names.add(base)
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+    return names
+
+def module_dependencies(module: ModuleType, modules: dict[str, ModuleType]) -> set[str]:
+    """ Names of the project modules that a module imports or imports objects from """
+    dependencies = {name for name in imported_names(module) if name in modules}
+    for value in list(vars(module).values()):
+        # Catches modules that were imported under another name (e.g. through sys.path entries)
+        if isinstance(value, ModuleType) and value.__name__ in modules:
+            dependencies.add(value.__name__)
+    dependencies.discard(module.__name__)
+    return dependencies
+
+def changed_modules(modules: dict[str, ModuleType]) -> set[str]:
+    """ Names of modules whose source changed since the last check 
+    Modules that are seen for the first time are recorded as unchanged
+    """
+    changed: set[str] = set()
+    for name, module in modules.items():
+        previous = SIGNATURES.get(name)
+        signature = source_signature(module.__file__, previous)
+        if signature is None:
+            continue
+        if previous and previous[2] != signature[2]:
+            changed.add(name)
+        SIGNATURES[name] = signature
+    return changed
+
+def reload_order(changed: set[str], dependencies: dict[str, set[str]]) -> list[str]:
+    """ Changed modules and everything that depends on them, dependencies first """
+    dependents: dict[str, set[str]] = {name: set() for name in dependencies}
+    for name, imports in dependencies.items():
+        for imported in imports:
+            dependents[imported].add(name)
+    
+    stale: set[str] = set()
+    pending = list(changed)
+    while pending:
+        name = pending.pop()
+        if name in stale:
+            continue
+        stale.add(name)
+        pending.extend(dependents.get(name, ()))
+    
+    order: list[str] = []
+    visited: set[str] = set()
+    def visit(name: str) -> None:
+        # Import cycles are broken at the first module visited
+        if name in visited:
+            return
+        visited.add(name)
+        for imported in sorted(dependencies.get(name, ())):
+            if imported in stale:
+                visit(imported)
+        order.append(name)
+        return
+    for name in sorted(stale):
+        visit(name)
+    return order
+
+def reload_changed(root: os.PathLike = ROOT) -> list[ModuleType]:
+    """ Reload the project modules whose source changed and the modules that depend on them
+    Modules are reloaded in dependency order so dependents bind to the reloaded objects.
+    Nothing is reloaded if no source file changed.
+    """
+    modules = project_modules(root)
+    changed = changed_modules(modules)
+    if not changed:
+        return []
+    dependencies = {name: module_dependencies(module, modules) for name, module in modules.items()}
+    order = reload_order(changed, dependencies)
+    reloaded: list[ModuleType] = []
+    for index, name in enumerate(order):
+        try:
+            reloaded.append(reload(modules[name]))
+        except Exception:
+            # Mark the failed and remaining modules as changed so they are retried on the next check
+            for stale in order[index:]:
+                SIGNATURES[stale] = (0, 0, "")
+            raise
+        SIGNATURES[name] = source_signature(modules[name].__file__)
+    return reloaded
+
 def get_module(module_name: str) -> type[Tool]:
     *_, tool = module_name.rsplit(".", 1)
     try:
-        return getattr(reload(import_module(module_name)), tool)
-    
+        module = import_module(module_name)
+        reload_changed()
+        return getattr(sys.modules.get(module_name, module), tool)
+
     # Catch all exceptions beacuse the imported class can raise any exception
     # The placeholder makes this obvious in the ArcGIS Pro GUI and we write the
     # Traceback to the description of the _BrokenImport 'tool' for easy debugging
     except Exception as e:
         return placeholder_tool(tool, e, format_exc(limit=1))
 
-def import_tools(tool_dict: dict[str, list[str]], tool_module_name: str = "tools") -> list[type[Tool]]:
+class LazyTool(Tool):
+    """ Stand in for a tool that is only imported when the tool is opened or run
+
+    The label, description and category come from the toolbox manifest so listing the
+    toolbox does not import the tool module or construct the ArcGISProject in Tool.__init__.
+    Subclasses are created by lazy_tool() with the module_name and manifest entry of the tool.
+    """
+    module_name: str = None
+    manifest_entry: dict[str, Any] = {}
+    _tool_class: type[Tool] = None
+
+    def __init__(self) -> None:
+        for attr, value in self.manifest_entry.items():
+            if attr in MANIFEST_ATTRIBUTES:
+                setattr(self, attr, value)
+        self._tool: Tool = None
+        return
+
+    @property
+    def tool(self) -> Tool:
+        """ The real tool, imported and initialized on first use """
+        if self._tool is None:
+            cls = type(self)
+            if cls._tool_class is None:
+                cls._tool_class = get_module(cls.module_name)
+            self._tool = cls._tool_class()
+        return self._tool
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes that are not set on the lazy tool
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.tool, name)
+
+    def getParameterInfo(self): return self.tool.getParameterInfo()
+    def isLicensed(self): return self.tool.isLicensed()
+    def updateParameters(self, parameters): return self.tool.updateParameters(parameters)
+    def updateMessages(self, parameters): return self.tool.updateMessages(parameters)
+    def execute(self, parameters, messages): return self.tool.execute(parameters, messages)
+    def postExecute(self, parameters): return self.tool.postExecute(parameters)
+
+def lazy_tool(module_name: str, manifest_entry: dict[str, Any]) -> type[LazyTool]:
+    """ Create a LazyTool subclass with the same name as the tool it stands in for """
+    *_, tool = module_name.rsplit(".", 1)
+    return type(tool, (LazyTool,), {"module_name": module_name, "manifest_entry": manifest_entry, "__module__": module_name})
+
+def source_mtime(module_name: str) -> float | None:
+    """ Modification time of the module source file without importing the module """
+    try:
+        spec = find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        return None
+    return os.path.getmtime(spec.origin)
+
+def manifest_entry(tool_class: type[Tool], mtime: float) -> dict[str, Any] | None:
+    """ Initialize a tool to record its manifest attributes (None if the tool is broken) 
+    Tools with lazy_load = False are only recorded as eager, they are not initialized
+    """
+    if tool_class.__name__ == "_BrokenImport":
+        return None
+    if not getattr(tool_class, "lazy_load", True):
+        return {"lazy_load": False, "mtime": mtime}
+    try:
+        tool = tool_class()
+    except Exception:
+        return None
+    entry = {attr: getattr(tool, attr) for attr in MANIFEST_ATTRIBUTES if hasattr(tool, attr)}
+    entry["mtime"] = mtime
+    return entry
+
+def read_manifest(manifest: os.PathLike) -> dict[str, dict[str, Any]]:
+    try:
+        with open(manifest, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_manifest(manifest: os.PathLike, entries: dict[str, dict[str, Any]]) -> None:
+    """ Write the manifest, failing silently if the toolbox directory is read only """
+    try:
+        temp = Path(manifest).with_suffix(".tmp")
+        with open(temp, "w") as f:
+            json.dump(entries, f, indent=4)
+        os.replace(temp, manifest)
+    except OSError:
+        pass
+    return
+
+def import_tools(tool_dict: dict[str, list[str]], tool_module_name: str = "tools", *,
+                 lazy: bool = False,
+                 manifest: os.PathLike = None) -> list[type[Tool]]:
     """ Import all tools from the provided dictionary.
     Default base module name is "tools".
     Expected format: {"module": ["tool1", "tool2", ...], ...}
+
+    With lazy=True tools listed in the manifest file are returned as LazyTool classes and their
+    modules are only imported when the tool is opened. Tools missing from the manifest or with
+    a source file that changed since the manifest entry are imported and their manifest entry is written.
+    Tools that set lazy_load = False (e.g. with a runtime label) are always imported.
     """
-    return \
+    module_names = \
         [
-            get_module(f'{tool_module_name}.{tool_sub_module}.{tool}')
+            f'{tool_module_name}.{tool_sub_module}.{tool}'
             for tool_sub_module, tools in tool_dict.items()
             for tool in tools
-        ]
\ No newline at end of file
+        ]
+
+    if not lazy:
+        return [get_module(module_name) for module_name in module_names]
+
+    if manifest is None:
+        raise ValueError("A manifest path is required for lazy tool imports")
+
+    entries = read_manifest(manifest)
+    changed = False
+    tools: list[type[Tool]] = []
+    for module_name in module_names:
+        mtime = source_mtime(module_name)
+        entry = entries.get(module_name)
+        if entry and mtime is not None and entry.get("mtime") == mtime and entry.get("lazy_load", True):
+            tools.append(lazy_tool(module_name, entry))
+            continue
+
+        tool_class = get_module(module_name)
+        tools.append(tool_class)
+        new_entry = manifest_entry(tool_class, mtime)
+        if new_entry is not None and mtime is not None and new_entry != entry:
+            entries[module_name] = new_entry
+            changed = True
+
+    if changed:
+        write_manifest(manifest, entries)
+    return tools
@@ -1,13 +1,86 @@
 import arcpy
 import os
+import time
 
-from typing import Any
+from typing import Any, Callable
 from abc import ABC
+from threading import RLock
+
+# Seconds the project metadata is reused before the current project is read again
+PROJECT_TTL = 30.0
+
+class ProjectContext:
+    """
+    Process wide, lazily loaded metadata of the current ArcGIS Pro project
+
+    ArcGISProject("CURRENT") is only constructed when a value is first read and is then
+    shared by all tools until the TTL expires or the context is invalidated. Toolboxes
+    invalidate the context when they are loaded, which happens when another project is
+    opened. Changes inside the open project (e.g. a new default geodatabase) are picked
+    up within PROJECT_TTL seconds.
+    """
+    def __init__(self, ttl: float = PROJECT_TTL) -> None:
+        self.ttl = ttl
+        self._lock = RLock()
+        self._project: arcpy.mp.ArcGISProject = None
+        self._loaded_at: float = 0.0
+        self._values: dict[str, Any] = {}
+        return
+
+    @property
+    def project(self) -> arcpy.mp.ArcGISProject:
+        with self._lock:
+            if self._project is None or time.monotonic() - self._loaded_at > self.ttl:
+                self._project = arcpy.mp.ArcGISProject("CURRENT")
+                self._loaded_at = time.monotonic()
+                self._values.clear()
+            return self._project
+
+    def _value(self, name: str, getter: Callable[[arcpy.mp.ArcGISProject], Any]) -> Any:
+        with self._lock:
+            project = self.project
+            if name not in self._values:
+                self._values[name] = getter(project)
+            return self._values[name]
+
+    @property
+    def file_path(self) -> str:
+        return self._value("file_path", lambda project: project.filePath)
+
+    @property
+    def home_folder(self) -> str:
+        return self._value("home_folder", lambda project: project.homeFolder)
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.home_folder)
+
+    @property
+    def default_gdb(self) -> str:
+        return self._value("default_gdb", lambda project: project.defaultGeodatabase)
+
+    @property
+    def databases(self) -> list[dict[str, str]]:
+        return self._value("databases", lambda project: project.databases)
+
+    def invalidate(self) -> None:
+        """ Drop the project so it is read again on next use (e.g. after project settings change) """
+        with self._lock:
+            self._project = None
+            self._values.clear()
+        return
+
+# Shared by every tool in the process, kept when this module is reloaded
+PROJECT: ProjectContext = globals().get("PROJECT") or ProjectContext()
 
 class Tool(ABC):
     """
     Base class for all tools that use python objects to build parameters
     """
+    # Tools with labels or descriptions computed at runtime (e.g. from the project or a git branch)
+    # set this to False so lazy toolboxes always import them instead of listing a stale manifest entry
+    lazy_load: bool = True
+    
     def __init__(self) -> None:
         """
         Tool Description
@@ -17,20 +90,27 @@ class Tool(ABC):
         self.description = "Base class for all tools"
         self.canRunInBackground = False
         self.category = "Unassigned"
-        
-        # Project variables
-        self.project = arcpy.mp.ArcGISProject("CURRENT")
-        self.project_location = self.project.homeFolder
-        self.project_name = os.path.basename(self.project_location)
-        
-        # Database variables
-        self.default_gdb = self.project.defaultGeodatabase
-        self.databases = self.project.databases
+
+        # Project and database variables are read from the shared PROJECT context on use
         return
-    
+
+    # Project variables
+    @property
+    def project(self) -> arcpy.mp.ArcGISProject: return PROJECT.project
+    @property
+    def project_location(self) -> str: return PROJECT.home_folder
+    @property
+    def project_name(self) -> str: return PROJECT.name
+
+    # Database variables
+    @property
+    def default_gdb(self) -> str: return PROJECT.default_gdb
+    @property
+    def databases(self) -> list[dict[str, str]]: return PROJECT.databases
+
     def getParameterInfo(self) -> list[arcpy.Parameter]: ...
     def isLicensed(self) -> bool: return True
     def updateParameters(self, parameters: list[arcpy.Parameter]) -> None: ...
     def updateMessages(self, parameters: list[arcpy.Parameter]) -> None: ...
     def execute(self, parameters: list[arcpy.Parameter], messages:list[Any]) -> None: ...
-    def postExecute(self, parameters: list[arcpy.Parameter]) -> None: ...
\ No newline at end of file
+    def postExecute(self, parameters: list[arcpy.Parameter]) -> None: ...